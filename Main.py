@@ -1,24 +1,80 @@
 import os
 import json
+import multiprocessing
 import argparse
+import csv
+import datetime
+import hashlib
+import re
 import shutil
-from typing import List, Dict, Optional
+import sys
+import time
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+try:
+	import fcntl
+except ImportError:  # Windows
+	fcntl = None
+try:
+	import msvcrt
+except ImportError:
+	msvcrt = None
+from typing import Any, Callable, Iterable, Iterator, List, Dict, NamedTuple, Optional, Set, Tuple
+
+from search_index import SearchIndex
+from thumbnails import ThumbnailCache
 
 
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.json")
 
 
-def _get_data_dir() -> str:
-	# Read data_dir from config.json if present; default to ./data
+def _load_config() -> Dict:
 	try:
 		if os.path.exists(CONFIG_FILE):
 			with open(CONFIG_FILE, "r", encoding="utf-8") as f:
 				cfg = json.load(f)
-				dd = cfg.get("data_dir")
-				if isinstance(dd, str) and dd.strip():
-					return dd
+				if isinstance(cfg, dict):
+					return cfg
 	except Exception:
 		pass
+	return {}
+
+
+_CONFIG = _load_config()
+
+
+_TRUE_WORDS = {"true", "1", "yes", "on"}
+_FALSE_WORDS = {"false", "0", "no", "off"}
+
+
+def _cfg_value(key: str, default):
+	# Typed config lookup; falls back to the default on missing or bad values
+	value = _CONFIG.get(key, default)
+	if isinstance(default, bool):
+		# bool("false") is True, so spell the accepted forms out
+		if isinstance(value, bool):
+			return value
+		if isinstance(value, int) and value in (0, 1):
+			return bool(value)
+		word = str(value).strip().lower()
+		if word in _TRUE_WORDS:
+			return True
+		if word in _FALSE_WORDS:
+			return False
+		return default
+	try:
+		return type(default)(value)
+	except (TypeError, ValueError):
+		return default
+
+
+def _get_data_dir() -> str:
+	# Read data_dir from config.json if present; default to ./data
+	dd = _CONFIG.get("data_dir")
+	if isinstance(dd, str) and dd.strip():
+		return dd
 	return os.path.join(os.path.dirname(__file__), "data")
 
 
@@ -26,6 +82,118 @@ DATA_DIR = _get_data_dir()
 NOTE_FILE = os.path.join(DATA_DIR, "boards_note.jsonl")
 EMP_FILE = os.path.join(DATA_DIR, "employees_note.jsonl")
 PICTURES_DIR = os.path.join(DATA_DIR, "pictures")
+# Photos are stored once per content under PHOTO_BLOBS_DIR/<sha256[:2]>/<sha256><ext>;
+# boards reference the blob path, so attaching the same file again costs a hash
+PHOTO_BLOBS_DIR = os.path.join(PICTURES_DIR, "blobs")
+# Cached previews of the details window (thumbnails.ThumbnailCache)
+PHOTO_THUMBS_DIR = os.path.join(PICTURES_DIR, ".thumbs")
+PHOTO_HASH_CHUNK = 1024 * 1024
+# gc-photos keeps unreferenced blobs younger than this (a save may be in flight)
+PHOTO_GC_GRACE = _cfg_value("photo_gc_grace_seconds", 3600)
+# Optional ingest (needs Pillow): new photos are downscaled to fit
+# PHOTO_MAX_DIM, EXIF-stripped and re-encoded; originals are only kept under
+# PHOTO_ORIGINALS_DIR when PHOTO_KEEP_ORIGINAL is set
+PHOTO_INGEST = _cfg_value("photo_ingest", False)
+PHOTO_MAX_DIM = int(_cfg_value("photo_max_dim", 1600))
+PHOTO_FORMAT = str(_cfg_value("photo_format", "JPEG")).upper()
+PHOTO_QUALITY = int(_cfg_value("photo_quality", 85))
+PHOTO_KEEP_ORIGINAL = _cfg_value("photo_keep_original", False)
+PHOTO_ORIGINALS_DIR = os.path.join(PICTURES_DIR, "originals")
+_PHOTO_EXT = {"JPEG": ".jpg", "WEBP": ".webp", "PNG": ".png"}
+# Spellings of the same type, so new blobs get one extension each
+_BLOB_EXT_ALIASES = {".jpeg": ".jpg", ".jpe": ".jpg", ".jfif": ".jpg", ".tif": ".tiff"}
+
+# Board writes append to the note file instead of rewriting it; deletes append a
+# tombstone. The file is compacted once dead records pass COMPACT_RATIO.
+BOARD_JOURNAL = _cfg_value("board_journal", True)
+COMPACT_RATIO = _cfg_value("compact_ratio", 0.5)
+COMPACT_MIN_DEAD = _cfg_value("compact_min_dead", 200)
+TOMBSTONE_KEY = "_deleted"
+
+# Several workstations may share DATA_DIR: writers take an advisory lock on a
+# "<file>.lock" sidecar (waiting up to LOCK_TIMEOUT seconds) and every board
+# record carries VERSION_KEY, bumped on each save, to detect stale updates
+LOCK_TIMEOUT = _cfg_value("lock_timeout_seconds", 10.0)
+# Re-reads of the note file only parse what was appended since the last one,
+# if the already-parsed part is unchanged: same file (device/inode) and same
+# bytes in its first and last PREFIX_CHECK bytes
+PREFIX_CHECK = 64 * 1024
+VERSION_KEY = "_version"
+# Whole-file rewrites go through "<file>.tmp" and an atomic rename; the file
+# they replace is kept as "<file>.bak", the snapshot restored at startup if
+# the main file cannot be read
+SNAPSHOT_SUFFIX = ".bak"
+WRITE_BUFFER = 1024 * 1024
+# Open GUI views follow other workstations' saves: a background thread checks
+# the store this often (0 turns it off)
+WATCH_INTERVAL = _cfg_value("watch_interval_seconds", 2.0)
+
+# "jsonl" (default) keeps the note files above; "sqlite" keeps boards and
+# employees in DB_FILE instead. Use the migrate-sqlite command to move data over.
+STORAGE_BACKEND = str(_cfg_value("storage_backend", "jsonl")).strip().lower()
+DB_FILE = os.path.join(DATA_DIR, "boards.db")
+
+
+class JsonCodec(NamedTuple):
+	name: str
+	# bytes or str -> object; raises ValueError on bad input
+	loads: Callable[[Any], Any]
+	# object -> one UTF-8 JSONL line, newline included
+	dump_line: Callable[[Any], bytes]
+
+
+def _std_dump_line(obj: Any) -> bytes:
+	return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _json_codec(name: str = "auto") -> JsonCodec:
+	"""Codec for the note files: orjson or ujson when installed, else the stdlib.
+
+	name picks one ("orjson", "ujson", "json"); a missing library falls back
+	to the next in that order.
+	"""
+	order = ("orjson", "ujson", "json")
+	if name in order:
+		order = (name,) + tuple(n for n in order if n != name)
+	for candidate in order:
+		if candidate == "json":
+			break
+		if candidate == "orjson":
+			try:
+				import orjson
+			except ImportError:
+				continue
+
+			def dump_line(obj: Any, _dumps=orjson.dumps, _opt=orjson.OPT_APPEND_NEWLINE) -> bytes:
+				try:
+					return _dumps(obj, option=_opt)
+				except TypeError:
+					# Non-str keys, ints beyond 64 bits...: the stdlib copes
+					return _std_dump_line(obj)
+
+			return JsonCodec("orjson", orjson.loads, dump_line)
+		if candidate == "ujson":
+			try:
+				import ujson
+			except ImportError:
+				continue
+
+			def dump_line(obj: Any, _dumps=ujson.dumps) -> bytes:
+				return (_dumps(obj, ensure_ascii=False, escape_forward_slashes=False) + "\n").encode("utf-8")
+
+			return JsonCodec("ujson", ujson.loads, dump_line)
+	return JsonCodec("json", json.loads, _std_dump_line)
+
+
+JSON_CODEC = _json_codec(str(_cfg_value("json_codec", "auto")).strip().lower())
+
+# Sort specs are a field name, optionally prefixed with "-" for descending
+NUMERIC_SORT_FIELDS = {"board_id", "module_number", "running_no", "running_no_p1", "running_no_p2"}
+DATE_SORT_FIELDS = {"date_request", "do_date", "date_repair"}
+# "issues.<flag>" specs sort on the issue checkboxes (unset sorts as False)
+FLAG_SORT_FIELDS = {"issues.no_issue", "issues.total_loss"}
+# Fields matched by the free-text search (case-insensitive substring)
+SEARCH_FIELDS = ("board_id", "name", "running_no", "size", "running_no_p1", "running_no_p2", "board_code")
 
 
 def _ensure_storage() -> None:
@@ -38,27 +206,1115 @@ def _ensure_storage() -> None:
 	os.makedirs(PICTURES_DIR, exist_ok=True)
 
 
+def _read_records(f, start: int = 0) -> Tuple[List[Dict], int, Optional[Dict]]:
+	"""Parse the JSONL records of binary file f from byte offset start.
+
+	Returns (records, end, trailing): end is the offset just past the last
+	complete line. A last line without a newline may be a write still in
+	progress, so it is not consumed; if it already parses it is returned as
+	trailing (a hand-edited file often lacks the final newline).
+	"""
+	f.seek(start)
+	records: List[Dict] = []
+	end = start
+	trailing = None
+	for line in f:
+		complete = line.endswith(b"\n")
+		if complete:
+			end += len(line)
+		line = line.strip()
+		if not line:
+			continue
+		try:
+			rec = JSON_CODEC.loads(line)
+		except ValueError:
+			# Skip malformed lines but keep the file intact
+			continue
+		if not isinstance(rec, dict):
+			continue
+		if complete:
+			records.append(rec)
+		else:
+			trailing = rec
+	return records, end, trailing
+
+
 def _load_boards() -> List[Dict]:
 	_ensure_storage()
-	boards: List[Dict] = []
-	with open(NOTE_FILE, "r", encoding="utf-8") as f:
-		for line in f:
-			line = line.strip()
-			if not line:
-				continue
+	with open(NOTE_FILE, "rb") as f:
+		records, _end, trailing = _read_records(f)
+	return records + [trailing] if trailing is not None else records
+
+
+def _fsync_dir(directory: str) -> None:
+	# Makes a rename durable; directories cannot be opened on Windows, where
+	# the rename is already durable once it returns
+	try:
+		fd = os.open(directory, os.O_RDONLY)
+	except OSError:
+		return
+	try:
+		os.fsync(fd)
+	except OSError:
+		pass
+	finally:
+		os.close(fd)
+
+
+def _atomic_write_lines(path: str, lines: Iterable[bytes]) -> None:
+	"""Replace path with lines (encoded, newline-terminated), all or nothing.
+
+	Lines are written in large chunks to path.tmp and fsynced, the current
+	file is kept as the snapshot (path + SNAPSHOT_SUFFIX, a hard link where
+	the file system allows), then the temp file is renamed over path and the
+	directory fsynced. A crash at any point leaves the old or the new file,
+	never a truncated one. The caller holds the file's lock (the temp name
+	is fixed).
+	"""
+	tmp = path + ".tmp"
+	try:
+		with open(tmp, "wb", buffering=WRITE_BUFFER) as f:
+			f.writelines(lines)
+			f.flush()
+			os.fsync(f.fileno())
+		if os.path.exists(path):
+			snapshot = path + SNAPSHOT_SUFFIX
 			try:
-				boards.append(json.loads(line))
-			except json.JSONDecodeError:
-				# Skip malformed lines but keep the file intact
-				continue
-	return boards
+				os.remove(snapshot)
+			except FileNotFoundError:
+				pass
+			try:
+				os.link(path, snapshot)
+			except OSError:
+				shutil.copyfile(path, snapshot)
+		os.replace(tmp, path)
+	except BaseException:
+		try:
+			os.remove(tmp)
+		except OSError:
+			pass
+		raise
+	_fsync_dir(os.path.dirname(path) or ".")
 
 
 def _write_boards(boards: List[Dict]) -> None:
 	_ensure_storage()
-	with open(NOTE_FILE, "w", encoding="utf-8") as f:
-		for b in boards:
-			f.write(json.dumps(b, ensure_ascii=False) + "\n")
+	_atomic_write_lines(NOTE_FILE, map(JSON_CODEC.dump_line, boards))
+
+
+def _request_month(board: Dict) -> Optional[int]:
+	# Month number of date_request ("YYYY-MM-DD"), None when missing/invalid
+	try:
+		return int(str(board.get("date_request")).split("-")[1])
+	except (IndexError, ValueError):
+		return None
+
+
+def _parse_sort(sort: Optional[str]) -> Tuple[Optional[str], bool]:
+	if not sort:
+		return None, False
+	if sort.startswith("-"):
+		return sort[1:], True
+	return sort, False
+
+
+# SQLite's LOWER() only folds ASCII
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _sort_key(field: str):
+	# Mirrored by SqliteStore._order_by; keep the two in step
+	if field in NUMERIC_SORT_FIELDS:
+		# Plain digit strings first, by value, then everything else as text
+		def key(b):
+			v = b.get(field)
+			s = "" if v is None else str(v)
+			if s.isascii() and s.isdigit():
+				return (0, int(s), "")
+			return (1, 0, s.translate(_ASCII_LOWER))
+	elif field in FLAG_SORT_FIELDS:
+		flag = field.split(".", 1)[1]
+
+		def key(b):
+			issues = b.get("issues")
+			return 1 if isinstance(issues, dict) and issues.get(flag) else 0
+	elif field == "urgency":
+		def key(b):
+			return 1 if b.get("urgency") else 0
+	elif field in DATE_SORT_FIELDS:
+		def key(b):
+			return str(b.get(field) or "")
+	else:
+		def key(b):
+			return str(b.get(field) or "").lower()
+	return key
+
+
+def _search_text(board: Dict) -> str:
+	# NUL-separated so a query never matches across two fields
+	return "\x00".join(str(board.get(k) or "").lower() for k in SEARCH_FIELDS)
+
+
+def _page(rows: List, limit: Optional[int], offset: int) -> List:
+	if offset:
+		rows = rows[offset:]
+	if limit is not None:
+		rows = rows[:limit]
+	return rows
+
+
+def _lock_file(path: str) -> int:
+	# Exclusive advisory lock on path (created if missing); returns the open fd
+	os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+	fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+	deadline = time.monotonic() + LOCK_TIMEOUT
+	delay = 0.005
+	while True:
+		try:
+			if fcntl is not None:
+				fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+			elif msvcrt is not None:
+				msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+			return fd
+		except OSError:
+			if time.monotonic() >= deadline:
+				os.close(fd)
+				raise TimeoutError(f"Data folder is busy: could not lock {path} within {LOCK_TIMEOUT:g}s")
+			time.sleep(delay)
+			delay = min(delay * 2, 0.1)
+
+
+def _unlock_file(fd: int) -> None:
+	try:
+		if fcntl is not None:
+			fcntl.flock(fd, fcntl.LOCK_UN)
+		elif msvcrt is not None:
+			os.lseek(fd, 0, os.SEEK_SET)
+			msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+	finally:
+		os.close(fd)
+
+
+class FileLock:
+	"""Writer lock for a data file, shared with other processes and workstations.
+
+	Advisory: only writers take it (readers rely on appends and atomic
+	replaces). Reentrant within a process, so a locked method can call
+	another one; threads of one process queue on an RLock first.
+	"""
+
+	def __init__(self, path: str):
+		self.path = path + ".lock"
+		self._thread_lock = threading.RLock()
+		self._depth = 0
+		self._fd: Optional[int] = None
+
+	def __enter__(self) -> "FileLock":
+		self._thread_lock.acquire()
+		if self._depth == 0:
+			try:
+				self._fd = _lock_file(self.path)
+			except BaseException:
+				self._thread_lock.release()
+				raise
+		self._depth += 1
+		return self
+
+	def __exit__(self, *exc) -> None:
+		self._depth -= 1
+		try:
+			if self._depth == 0:
+				fd, self._fd = self._fd, None
+				_unlock_file(fd)
+		finally:
+			self._thread_lock.release()
+
+
+_file_locks: Dict[str, FileLock] = {}
+_file_locks_guard = threading.Lock()
+
+
+def _file_lock(path: str) -> FileLock:
+	# One FileLock per data file, so every writer in the process shares it
+	key = os.path.abspath(path)
+	with _file_locks_guard:
+		lock = _file_locks.get(key)
+		if lock is None:
+			lock = _file_locks[key] = FileLock(path)
+		return lock
+
+
+class ConflictError(ValueError):
+	"""A write was based on an out-of-date copy of a board: someone else saved
+	(or deleted) it first. Nothing was written; reload and try again."""
+
+	def __init__(self, conflicts: List[Tuple[str, str]]):
+		self.board_ids = [bid for bid, _reason in conflicts]
+		msg = "; ".join(f"Board '{bid}' {reason}" for bid, reason in conflicts[:5])
+		if len(conflicts) > 5:
+			msg += f"; and {len(conflicts) - 5} more"
+		super().__init__(msg)
+
+
+def _record_version(board: Dict) -> int:
+	try:
+		return int(board.get(VERSION_KEY) or 0)
+	except (TypeError, ValueError):
+		return 0
+
+
+def _check_versions(current: Dict[str, Optional[int]], expected: Optional[Dict[str, Optional[int]]]) -> None:
+	# current/expected map board_id -> version, None for "no such board";
+	# boards the caller has no expectation for are written unconditionally
+	conflicts = []
+	for bid, want in (expected or {}).items():
+		have = current.get(bid)
+		if want == have:
+			continue
+		if want is None:
+			reason = "already exists"
+		elif have is None:
+			reason = "was deleted by someone else"
+		else:
+			reason = "was changed by someone else"
+		conflicts.append((bid, reason))
+	if conflicts:
+		raise ConflictError(conflicts)
+
+
+def _stamped(boards: List[Dict], current: Dict[str, Optional[int]]) -> List[Dict]:
+	# Copies of boards numbered one past the stored version
+	out = []
+	for b in boards:
+		rec = dict(b)
+		rec[VERSION_KEY] = (current.get(str(b.get("board_id"))) or 0) + 1
+		out.append(rec)
+	return out
+
+
+class BoardStore:
+	"""In-memory copy of the boards note file, indexed by board_id.
+
+	The file is parsed once and only re-read when its mtime or size changes,
+	so lookups are dict hits and listing does no I/O while nothing changed.
+	Returned dicts are shared with the cache; treat them as read-only.
+
+	In journal mode the file is replayed in order: a later record for the same
+	board_id replaces the earlier one and a tombstone removes it.
+
+	Writes hold the file's FileLock only to re-check the file, compare versions
+	and append; put/remove take the versions the caller's changes are based
+	on and raise ConflictError if another writer got there first.
+	"""
+
+	def __init__(self, path: str, journal: bool = True):
+		self.path = path
+		self.journal = journal
+		self._boards: Dict[str, Dict] = {}
+		self._sig: Optional[Tuple[int, int]] = None
+		self._records = 0
+		# Bytes parsed so far (complete lines only) and the fingerprint of that
+		# prefix; a later re-read that finds the same prefix parses only the rest
+		self._offset = 0
+		self._mark: Optional[Tuple] = None
+		# Per-board values derived for queries (sort keys, search text, month),
+		# built on first use and kept in step with put/remove
+		self._derived: Dict[str, Tuple[Callable[[Dict], Any], Dict[str, Any]]] = {}
+		# Trigram index over SEARCH_FIELDS, also built on first use
+		self._search: Optional[SearchIndex] = None
+		# Reentrant: put/remove may compact, and the GUI queries from a worker thread
+		self._lock = threading.RLock()
+		self._file_lock = _file_lock(path)
+		# IDs changed by other processes since the last take_changes(); None
+		# until someone asks, so nothing is diffed without a watcher
+		self._changed: Optional[Set[str]] = None
+
+	def _file_sig(self) -> Optional[Tuple[int, int]]:
+		try:
+			st = os.stat(self.path)
+		except OSError:
+			return None
+		return (st.st_mtime_ns, st.st_size)
+
+	def _prefix_mark(self, f, end: int) -> Tuple:
+		st = os.fstat(f.fileno())
+		f.seek(0)
+		head = f.read(min(end, PREFIX_CHECK))
+		tail_start = max(min(end, PREFIX_CHECK), end - PREFIX_CHECK)
+		f.seek(tail_start)
+		tail = f.read(end - tail_start)
+		return (st.st_dev, st.st_ino, end, hashlib.blake2b(head + tail, digest_size=16).digest())
+
+	def _refresh(self) -> None:
+		sig = self._file_sig()
+		if sig is not None and sig == self._sig:
+			return
+		# Take the signature before parsing so a concurrent write is picked up next time
+		_ensure_storage()
+		with open(self.path, "rb") as f:
+			grown = (
+				self._mark is not None
+				and os.fstat(f.fileno()).st_size >= self._offset
+				and self._prefix_mark(f, self._offset) == self._mark
+			)
+			records, end, trailing = _read_records(f, self._offset if grown else 0)
+			if trailing is not None:
+				# Applied now, counted (and parsed again) once its newline lands
+				records.append(trailing)
+			if grown:
+				self._apply_tail(records)
+			else:
+				self._load_all(records)
+			self._records -= trailing is not None
+			self._offset = end
+			self._mark = self._prefix_mark(f, end)
+		self._sig = sig if sig is not None else self._file_sig()
+
+	def _load_all(self, records: List[Dict]) -> None:
+		index: Dict[str, Dict] = {}
+		for b in records:
+			bid = str(b.get("board_id"))
+			if b.get(TOMBSTONE_KEY):
+				index.pop(bid, None)
+			else:
+				index[bid] = b
+		if self._changed is not None and self._sig is not None:
+			# Our own writes are already in the index, so only other writers' show up
+			old = self._boards
+			self._changed.update(bid for bid in old.keys() | index.keys() if old.get(bid) != index.get(bid))
+		self._reset_index(index)
+		self._records = len(records)
+
+	def _apply_tail(self, records: List[Dict]) -> None:
+		# Records appended since the last read, replayed onto the live index
+		for b in records:
+			bid = str(b.get("board_id"))
+			if b.get(TOMBSTONE_KEY):
+				if bid not in self._boards:
+					continue
+				self._index_pop(bid)
+			else:
+				if self._boards.get(bid) == b:
+					continue
+				self._index_put(b)
+			if self._changed is not None:
+				self._changed.add(bid)
+		self._records += len(records)
+
+	def _mark_synced(self) -> None:
+		# After our own write: the whole file is known to match the index
+		with open(self.path, "rb") as f:
+			end = os.fstat(f.fileno()).st_size
+			self._offset = end
+			self._mark = self._prefix_mark(f, end)
+		self._sig = self._file_sig()
+
+	def _reset_index(self, index: Dict[str, Dict]) -> None:
+		self._boards = index
+		self._derived = {}
+		self._search = None
+
+	def _index_put(self, board: Dict) -> None:
+		bid = str(board.get("board_id"))
+		self._boards[bid] = board
+		for fn, values in self._derived.values():
+			values[bid] = fn(board)
+		if self._search is not None:
+			self._search.add(bid, _search_text(board))
+
+	def _index_pop(self, board_id: str) -> None:
+		if self._boards.pop(board_id, None) is not None:
+			for _fn, values in self._derived.values():
+				values.pop(board_id, None)
+			if self._search is not None:
+				self._search.discard(board_id)
+
+	def _derive(self, name: str, fn: Callable[[Dict], Any]) -> Dict[str, Any]:
+		entry = self._derived.get(name)
+		if entry is None:
+			entry = (fn, {bid: fn(b) for bid, b in self._boards.items()})
+			self._derived[name] = entry
+		return entry[1]
+
+	def _search_index(self) -> SearchIndex:
+		if self._search is None:
+			self._search = SearchIndex((bid, _search_text(b)) for bid, b in self._boards.items())
+		return self._search
+
+	@property
+	def dead_records(self) -> int:
+		with self._lock:
+			self._refresh()
+			return self._records - len(self._boards)
+
+	def take_changes(self) -> Optional[Set[str]]:
+		"""Re-check the file; returns the board IDs other processes changed since the last call."""
+		with self._lock:
+			if self._changed is None:
+				self._changed = set()
+			self._refresh()
+			changed, self._changed = self._changed, set()
+			return changed
+
+	def get(self, board_id: str) -> Optional[Dict]:
+		with self._lock:
+			self._refresh()
+			return self._boards.get(str(board_id))
+
+	def all(self) -> List[Dict]:
+		with self._lock:
+			self._refresh()
+			return list(self._boards.values())
+
+	def query(
+		self,
+		site: Optional[str] = None,
+		size: Optional[str] = None,
+		created_by: Optional[str] = None,
+		urgency: Optional[bool] = None,
+		months: Optional[List[int]] = None,
+		text: Optional[str] = None,
+		sort: Optional[str] = None,
+		limit: Optional[int] = None,
+		offset: int = 0,
+	) -> List[Dict]:
+		with self._lock:
+			self._refresh()
+			month_set = set(months or ())
+			month_of = self._derive("month", _request_month) if month_set else None
+			needle = (text or "").strip().lower()
+			field, reverse = _parse_sort(sort)
+			keys = self._derive("sort:" + field, _sort_key(field)) if field else None
+			# Single pass collecting ids, over the search index hits when there is
+			# a text query; sort keys come precomputed from the cache and boards
+			# are only looked up for the requested page
+			boards = self._boards
+			if needle:
+				candidates = ((bid, boards[bid]) for bid in self._search_index().search(needle))
+			else:
+				candidates = boards.items()
+			hits = []
+			for bid, b in candidates:
+				if site is not None and str(b.get("name")) != site:
+					continue
+				if size is not None and str(b.get("size")) != size:
+					continue
+				if created_by is not None and str(b.get("created_by")) != created_by:
+					continue
+				if urgency is not None and bool(b.get("urgency", False)) != urgency:
+					continue
+				if month_of is not None and month_of[bid] not in month_set:
+					continue
+				hits.append(bid)
+			if keys is not None:
+				hits.sort(key=keys.__getitem__, reverse=reverse)
+			return [boards[bid] for bid in _page(hits, limit, offset)]
+
+	def iter_query(self, **filters) -> Iterator[Dict]:
+		# Records are already in memory; query() only collects references
+		yield from self.query(**filters)
+
+	def distinct(self, field: str) -> List[str]:
+		with self._lock:
+			self._refresh()
+			return sorted({str(b.get(field)) for b in self._boards.values() if b.get(field)})
+
+	def _versions(self, board_ids) -> Dict[str, Optional[int]]:
+		versions: Dict[str, Optional[int]] = {}
+		for bid in board_ids:
+			b = self._boards.get(str(bid))
+			versions[str(bid)] = None if b is None else _record_version(b)
+		return versions
+
+	def existing(self, board_ids) -> Set[str]:
+		"""The given IDs that name a stored board."""
+		with self._lock:
+			self._refresh()
+			return {bid for bid, v in self._versions(board_ids).items() if v is not None}
+
+	def replace_all(self, boards: List[Dict]) -> None:
+		with self._lock, self._file_lock:
+			_write_boards(boards)
+			self._reset_index({str(b.get("board_id")): b for b in boards})
+			self._records = len(boards)
+			self._mark_synced()
+
+	def put(self, boards: List[Dict], expected: Optional[Dict[str, Optional[int]]] = None) -> List[Dict]:
+		"""Insert or replace whole records; returns them with their new versions.
+
+		expected maps board_id -> the version the change is based on (None:
+		the board must not exist yet); on any mismatch nothing is written and
+		ConflictError is raised.
+		"""
+		with self._lock, self._file_lock:
+			# Pick up other workstations' writes before comparing versions
+			self._refresh()
+			current = self._versions(b.get("board_id") for b in boards)
+			_check_versions(current, expected)
+			records = _stamped(boards, current)
+			if not self.journal:
+				merged = dict(self._boards)
+				for b in records:
+					merged[str(b.get("board_id"))] = b
+				self.replace_all(list(merged.values()))
+				return records
+			self._append(records)
+			for b in records:
+				self._index_put(b)
+			self._maybe_compact()
+			return records
+
+	def remove(self, board_ids: List[str], expected: Optional[Dict[str, Optional[int]]] = None) -> int:
+		with self._lock, self._file_lock:
+			self._refresh()
+			_check_versions(self._versions((expected or {}).keys()), expected)
+			ids = [str(i) for i in board_ids if str(i) in self._boards]
+			if not ids:
+				return 0
+			if not self.journal:
+				gone = set(ids)
+				self.replace_all([b for bid, b in self._boards.items() if bid not in gone])
+				return len(ids)
+			self._append([{"board_id": bid, TOMBSTONE_KEY: True} for bid in ids])
+			for bid in ids:
+				self._index_pop(bid)
+			self._maybe_compact()
+			return len(ids)
+
+	def _append(self, records: List[Dict]) -> None:
+		_ensure_storage()
+		data = b"".join(map(JSON_CODEC.dump_line, records))
+		with open(self.path, "ab+") as f:
+			# Never glue a record onto a hand-edited last line without a newline
+			start = f.seek(0, os.SEEK_END)
+			if start > 0:
+				f.seek(-1, os.SEEK_END)
+				if f.read(1) != b"\n":
+					data = b"\n" + data
+			f.write(data)
+		# Only trust the cache if nobody else wrote to the file since our last read;
+		# otherwise the next refresh replays the tail, ours included, in file order
+		sig = self._file_sig()
+		if (
+			self._sig is not None and sig is not None
+			and start == self._sig[1] == self._offset and sig[1] == start + len(data)
+		):
+			self._records += len(records)
+			self._mark_synced()
+		else:
+			self._sig = None
+
+	def _maybe_compact(self) -> None:
+		# Runs after the caller's records are already appended, so a failure
+		# here (disk full, file held open on another workstation...) must not
+		# turn a saved write into an error; the next write tries again
+		dead = self._records - len(self._boards)
+		if dead >= COMPACT_MIN_DEAD and dead >= COMPACT_RATIO * self._records:
+			try:
+				self.compact()
+			except (OSError, TimeoutError) as e:
+				print(f"Warning: compacting {os.path.basename(self.path)} failed, will retry: {e}", file=sys.stderr)
+
+	def compact(self) -> int:
+		"""Rewrite the file with live records only; returns the dead records dropped."""
+		with self._lock, self._file_lock:
+			self._refresh()
+			dead = self._records - len(self._boards)
+			boards = list(self._boards.values())
+			_atomic_write_lines(self.path, map(JSON_CODEC.dump_line, boards))
+			self._records = len(boards)
+			self._mark_synced()
+			return dead
+
+
+class SqliteStore:
+	"""Boards and employees kept in a local SQLite database.
+
+	Offers the same interface as BoardStore; filters and sorting in query()
+	run as SQL against indexed columns. The full record is stored as JSON in
+	the data column so extra fields round-trip unchanged.
+	"""
+
+	# Columns copied out of the record for filtering/sorting
+	COLUMNS = ("name", "size", "created_by", "date_request", "module_number", "running_no", "running_no_p1", "running_no_p2")
+
+	def __init__(self, path: str):
+		self.path = path
+		self._db: Optional[sqlite3.Connection] = None
+		self._lock = threading.Lock()
+		self.dead_records = 0
+		self._data_version: Optional[int] = None
+		# FTS5 trigram search available (SQLite >= 3.34 built with FTS5);
+		# otherwise text search is a LIKE scan of the boards table
+		self._fts = False
+
+	def _conn(self) -> sqlite3.Connection:
+		if self._db is None:
+			os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+			os.makedirs(PICTURES_DIR, exist_ok=True)
+			db = sqlite3.connect(self.path, check_same_thread=False)
+			cols = "".join(f", {c} TEXT" for c in self.COLUMNS)
+			db.executescript(f"""
+				CREATE TABLE IF NOT EXISTS boards (
+					seq INTEGER PRIMARY KEY AUTOINCREMENT,
+					board_id TEXT NOT NULL UNIQUE{cols},
+					urgency INTEGER NOT NULL DEFAULT 0,
+					req_month INTEGER,
+					data TEXT NOT NULL
+				);
+				CREATE INDEX IF NOT EXISTS idx_boards_name ON boards(name);
+				CREATE INDEX IF NOT EXISTS idx_boards_size ON boards(size);
+				CREATE INDEX IF NOT EXISTS idx_boards_created_by ON boards(created_by);
+				CREATE INDEX IF NOT EXISTS idx_boards_date_request ON boards(date_request);
+				CREATE TABLE IF NOT EXISTS employees (
+					username TEXT PRIMARY KEY,
+					password TEXT NOT NULL
+				);
+				CREATE TABLE IF NOT EXISTS meta (
+					key TEXT PRIMARY KEY,
+					value TEXT
+				);
+			""")
+			self._init_search(db)
+			self._db = db
+		return self._db
+
+	def _search_expr(self, row: str, c: str) -> str:
+		if c == "board_id" or c in self.COLUMNS:
+			return f"{row}.{c}"
+		return f"json_extract({row}.data, '$.{c}')"
+
+	def _init_search(self, db: sqlite3.Connection) -> None:
+		# FTS5 trigram table over SEARCH_FIELDS (rowid = boards.seq), kept in
+		# step with boards by triggers; backfilled when missing, out of sync or
+		# flagged stale by a client without FTS5 (see _begin_write)
+		self._fts = False
+		if sqlite3.sqlite_version_info < (3, 34, 0):
+			return
+		fields = ", ".join(SEARCH_FIELDS)
+		new_vals = ", ".join(self._search_expr("new", c) for c in SEARCH_FIELDS)
+		src_vals = ", ".join(self._search_expr("boards", c) for c in SEARCH_FIELDS)
+		try:
+			with db:
+				# One transaction, so an older client cannot drop the triggers
+				# between creating them and clearing the stale flag
+				db.execute("BEGIN IMMEDIATE")
+				db.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS boards_fts USING fts5({fields}, tokenize = 'trigram')")
+				db.execute(f"""
+					CREATE TRIGGER IF NOT EXISTS boards_fts_ai AFTER INSERT ON boards BEGIN
+						INSERT INTO boards_fts (rowid, {fields}) VALUES (new.seq, {new_vals});
+					END
+				""")
+				db.execute("""
+					CREATE TRIGGER IF NOT EXISTS boards_fts_ad AFTER DELETE ON boards BEGIN
+						DELETE FROM boards_fts WHERE rowid = old.seq;
+					END
+				""")
+				db.execute(f"""
+					CREATE TRIGGER IF NOT EXISTS boards_fts_au AFTER UPDATE ON boards BEGIN
+						DELETE FROM boards_fts WHERE rowid = old.seq;
+						INSERT INTO boards_fts (rowid, {fields}) VALUES (new.seq, {new_vals});
+					END
+				""")
+				stale = db.execute("SELECT 1 FROM meta WHERE key = 'fts_stale'").fetchone()
+				n_boards = db.execute("SELECT COUNT(*) FROM boards").fetchone()[0]
+				n_fts = db.execute("SELECT COUNT(*) FROM boards_fts").fetchone()[0]
+				if stale or n_boards != n_fts:
+					db.execute("DELETE FROM boards_fts")
+					db.execute(f"INSERT INTO boards_fts (rowid, {fields}) SELECT seq, {src_vals} FROM boards")
+					db.execute("DELETE FROM meta WHERE key = 'fts_stale'")
+		except sqlite3.OperationalError as e:
+			# "no such module: fts5" / "no such tokenizer: trigram"; a busy
+			# database is a real error
+			if "no such" not in str(e):
+				raise
+			return
+		self._fts = True
+
+	def _begin_write(self, db: sqlite3.Connection) -> None:
+		db.execute("BEGIN IMMEDIATE")
+		if self._fts:
+			return
+		# Triggers left by a client with FTS5 would fail every write here
+		# ("no such module"): drop them and flag the index for a rebuild
+		names = [r[0] for r in db.execute(
+			"SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'boards\\_fts\\_%' ESCAPE '\\'"
+		)]
+		if names:
+			for name in names:
+				db.execute(f"DROP TRIGGER IF EXISTS {name}")
+			db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fts_stale', '1')")
+
+	def _check_search(self, db: sqlite3.Connection) -> None:
+		# A client without FTS5 wrote since we built the index: rebuild it
+		if self._fts and db.execute("SELECT 1 FROM meta WHERE key = 'fts_stale'").fetchone():
+			self._init_search(db)
+
+	def _row(self, b: Dict) -> Tuple:
+		cols = tuple(None if b.get(c) is None else str(b.get(c)) for c in self.COLUMNS)
+		return (str(b.get("board_id")),) + cols + (
+			1 if b.get("urgency") else 0,
+			_request_month(b),
+			json.dumps(b, ensure_ascii=False),
+		)
+
+	def take_changes(self) -> Optional[Set[str]]:
+		"""Empty set if no other connection committed since the last call, else None (IDs unknown)."""
+		with self._lock:
+			# data_version only moves for other connections' commits
+			version = self._conn().execute("PRAGMA data_version").fetchone()[0]
+			last, self._data_version = self._data_version, version
+			return set() if last is None or last == version else None
+
+	def get(self, board_id: str) -> Optional[Dict]:
+		with self._lock:
+			row = self._conn().execute("SELECT data FROM boards WHERE board_id = ?", (str(board_id),)).fetchone()
+		return JSON_CODEC.loads(row[0]) if row else None
+
+	def all(self) -> List[Dict]:
+		with self._lock:
+			rows = self._conn().execute("SELECT data FROM boards ORDER BY seq").fetchall()
+		return [JSON_CODEC.loads(r[0]) for r in rows]
+
+	def query(
+		self,
+		site: Optional[str] = None,
+		size: Optional[str] = None,
+		created_by: Optional[str] = None,
+		urgency: Optional[bool] = None,
+		months: Optional[List[int]] = None,
+		text: Optional[str] = None,
+		sort: Optional[str] = None,
+		limit: Optional[int] = None,
+		offset: int = 0,
+	) -> List[Dict]:
+		with self._lock:
+			db = self._conn()
+			if text:
+				self._check_search(db)
+			sql, params = self._query_sql(
+				site=site, size=size, created_by=created_by, urgency=urgency, months=months,
+				text=text, sort=sort, limit=limit, offset=offset,
+			)
+			rows = db.execute(sql, params).fetchall()
+		return [JSON_CODEC.loads(r[0]) for r in rows]
+
+	def iter_query(self, **filters) -> Iterator[Dict]:
+		# Streams rows through a separate read connection so the store's
+		# connection (and lock) are not held while the caller consumes them
+		with self._lock:
+			conn = self._conn()
+			if filters.get("text"):
+				self._check_search(conn)
+		sql, params = self._query_sql(**filters)
+		db = sqlite3.connect(self.path)
+		try:
+			cur = db.execute(sql, params)
+			while True:
+				rows = cur.fetchmany(500)
+				if not rows:
+					break
+				for r in rows:
+					yield JSON_CODEC.loads(r[0])
+		finally:
+			db.close()
+
+	def _query_sql(
+		self,
+		site: Optional[str] = None,
+		size: Optional[str] = None,
+		created_by: Optional[str] = None,
+		urgency: Optional[bool] = None,
+		months: Optional[List[int]] = None,
+		text: Optional[str] = None,
+		sort: Optional[str] = None,
+		limit: Optional[int] = None,
+		offset: int = 0,
+	) -> Tuple[str, List]:
+		where: List[str] = []
+		params: List = []
+		for col, val in (("name", site), ("size", size), ("created_by", created_by)):
+			if val is not None:
+				where.append(f"{col} = ?")
+				params.append(val)
+		if urgency is not None:
+			where.append("urgency = ?")
+			params.append(1 if urgency else 0)
+		if months:
+			where.append(f"req_month IN ({','.join('?' * len(months))})")
+			params.extend(int(m) for m in months)
+		needle = (text or "").strip()
+		if self._fts and len(needle) >= 3:
+			# Quoted as one FTS5 string: trigram phrase = substring in any field
+			where.append("seq IN (SELECT rowid FROM boards_fts WHERE boards_fts MATCH ?)")
+			params.append('"' + needle.replace('"', '""') + '"')
+		elif needle:
+			# Too short for trigrams (or no FTS5): LIKE scan of the search columns
+			like = "%" + needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+			if self._fts:
+				cond = " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in SEARCH_FIELDS)
+				where.append(f"seq IN (SELECT rowid FROM boards_fts WHERE {cond})")
+			else:
+				cond = " OR ".join(f"{self._search_expr('boards', c)} LIKE ? ESCAPE '\\'" for c in SEARCH_FIELDS)
+				where.append(f"({cond})")
+			params.extend([like] * len(SEARCH_FIELDS))
+		sql = "SELECT data FROM boards"
+		if where:
+			sql += " WHERE " + " AND ".join(where)
+		sql += " ORDER BY " + self._order_by(sort)
+		if limit is not None or offset:
+			sql += " LIMIT ? OFFSET ?"
+			params.extend([-1 if limit is None else int(limit), int(offset or 0)])
+		return sql, params
+
+	def _order_by(self, sort: Optional[str]) -> str:
+		# Orders exactly like _sort_key for the JSONL store
+		field, reverse = _parse_sort(sort)
+		direction = "DESC" if reverse else "ASC"
+		if field in FLAG_SORT_FIELDS:
+			return f"CASE WHEN json_extract(data, '$.{field}') THEN 1 ELSE 0 END {direction}, seq"
+		if not field or not field.replace("_", "").isalnum():
+			return "seq"
+		if field in self.COLUMNS or field in ("board_id", "urgency"):
+			expr = field
+		else:
+			expr = f"json_extract(data, '$.{field}')"
+		if field in NUMERIC_SORT_FIELDS:
+			s = f"COALESCE(CAST({expr} AS TEXT), '')"
+			is_text = f"({s} = '' OR {s} GLOB '*[^0-9]*')"
+			return (
+				f"{is_text} {direction}, "
+				f"CASE WHEN {is_text} THEN 0 ELSE CAST({s} AS INTEGER) END {direction}, "
+				f"CASE WHEN {is_text} THEN LOWER({s}) ELSE '' END {direction}, seq"
+			)
+		elif field in DATE_SORT_FIELDS:
+			expr = f"COALESCE({expr}, '')"
+		elif field != "urgency":
+			expr = f"COALESCE({expr}, '') COLLATE NOCASE"
+		return f"{expr} {'DESC' if reverse else 'ASC'}, seq"
+
+	def distinct(self, field: str) -> List[str]:
+		if field not in self.COLUMNS:
+			return sorted({str(b.get(field)) for b in self.all() if b.get(field)})
+		with self._lock:
+			rows = self._conn().execute(
+				f"SELECT DISTINCT {field} FROM boards WHERE {field} IS NOT NULL AND {field} != '' ORDER BY {field}"
+			).fetchall()
+		return [r[0] for r in rows]
+
+	def _versions(self, db: sqlite3.Connection, board_ids) -> Dict[str, Optional[int]]:
+		ids = list(dict.fromkeys(str(i) for i in board_ids))
+		versions: Dict[str, Optional[int]] = dict.fromkeys(ids)
+		for i in range(0, len(ids), 500):
+			chunk = ids[i:i + 500]
+			rows = db.execute(
+				f"SELECT board_id, data FROM boards WHERE board_id IN ({','.join('?' * len(chunk))})", chunk
+			).fetchall()
+			for bid, data in rows:
+				versions[bid] = _record_version(JSON_CODEC.loads(data))
+		return versions
+
+	def existing(self, board_ids) -> Set[str]:
+		# One IN (...) query per 500 IDs
+		with self._lock:
+			versions = self._versions(self._conn(), board_ids)
+		return {bid for bid, v in versions.items() if v is not None}
+
+	def _upsert(self, db: sqlite3.Connection, boards: List[Dict]) -> None:
+		names = ("board_id",) + self.COLUMNS + ("urgency", "req_month", "data")
+		updates = ", ".join(f"{n} = excluded.{n}" for n in names[1:])
+		sql = (
+			f"INSERT INTO boards ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+			f"ON CONFLICT(board_id) DO UPDATE SET {updates}"
+		)
+		db.executemany(sql, [self._row(b) for b in boards])
+
+	def put(self, boards: List[Dict], expected: Optional[Dict[str, Optional[int]]] = None) -> List[Dict]:
+		# Versions are compared and bumped inside one write transaction
+		# (BEGIN IMMEDIATE), which SQLite serializes across processes
+		with self._lock:
+			db = self._conn()
+			with db:
+				self._begin_write(db)
+				current = self._versions(db, (b.get("board_id") for b in boards))
+				_check_versions(current, expected)
+				records = _stamped(boards, current)
+				self._upsert(db, records)
+		return records
+
+	def replace_all(self, boards: List[Dict]) -> None:
+		# Raw copy: versions are kept as they are
+		with self._lock:
+			db = self._conn()
+			with db:
+				self._begin_write(db)
+				db.execute("DELETE FROM boards")
+				self._upsert(db, boards)
+
+	def remove(self, board_ids: List[str], expected: Optional[Dict[str, Optional[int]]] = None) -> int:
+		ids = [str(i) for i in board_ids]
+		removed = 0
+		with self._lock:
+			db = self._conn()
+			with db:
+				self._begin_write(db)
+				_check_versions(self._versions(db, (expected or {}).keys()), expected)
+				for i in range(0, len(ids), 500):
+					chunk = ids[i:i + 500]
+					cur = db.execute(f"DELETE FROM boards WHERE board_id IN ({','.join('?' * len(chunk))})", chunk)
+					removed += cur.rowcount
+		return removed
+
+	def compact(self) -> int:
+		with self._lock:
+			self._conn().execute("VACUUM")
+		return 0
+
+	def load_employees(self) -> List[Dict]:
+		with self._lock:
+			rows = self._conn().execute("SELECT username, password FROM employees ORDER BY rowid").fetchall()
+		return [{"username": u, "password": p} for u, p in rows]
+
+	def write_employees(self, emps: List[Dict]) -> None:
+		with self._lock:
+			db = self._conn()
+			with db:
+				db.execute("DELETE FROM employees")
+				db.executemany(
+					"INSERT OR REPLACE INTO employees (username, password) VALUES (?, ?)",
+					[(str(e.get("username")), str(e.get("password"))) for e in emps],
+				)
+
+
+def _unreadable(path: str) -> bool:
+	# Missing, or has content but not a single record parses (an empty file
+	# is a valid empty inventory)
+	try:
+		with open(path, "r", encoding="utf-8", errors="replace") as f:
+			empty = True
+			for line in f:
+				line = line.strip()
+				if not line:
+					continue
+				empty = False
+				try:
+					if isinstance(JSON_CODEC.loads(line), dict):
+						return False
+				except ValueError:
+					continue
+			return not empty
+	except OSError:
+		return True
+
+
+def _recover_file(path: str) -> Optional[str]:
+	"""Startup check: restore path from its snapshot if it cannot be read.
+
+	The damaged file is kept next to it as "<file>.damaged-<time>". Returns a
+	message when something was restored.
+	"""
+	snapshot = path + SNAPSHOT_SUFFIX
+	if not os.path.exists(snapshot) or not _unreadable(path):
+		return None
+	with _file_lock(path):
+		# Another workstation may have restored it while we waited
+		if not _unreadable(path) or _unreadable(snapshot):
+			return None
+		damaged = None
+		if os.path.exists(path):
+			damaged = f"{path}.damaged-{time.strftime('%Y%m%d-%H%M%S')}"
+			os.replace(path, damaged)
+		with open(snapshot, "rb") as f:
+			_atomic_write_lines(path, f)
+	kept = f" (damaged file kept as {os.path.basename(damaged)})" if damaged else ""
+	return f"{os.path.basename(path)} could not be read; restored the last good snapshot{kept}."
+
+
+def _open_store():
+	if STORAGE_BACKEND == "sqlite":
+		return SqliteStore(DB_FILE)
+	for path in (NOTE_FILE, EMP_FILE):
+		try:
+			note = _recover_file(path)
+		except OSError as e:
+			note = f"{os.path.basename(path)} could not be read and restoring its snapshot failed: {e}"
+		if note:
+			print(f"Warning: {note}", file=sys.stderr)
+	return BoardStore(NOTE_FILE, journal=BOARD_JOURNAL)
+
+
+_board_store = _open_store()
+
+
+class BoardWatcher:
+	"""Follows other processes' changes to a board store.
+
+	A daemon thread calls store.take_changes() every interval seconds (a
+	stat of the note file, or one PRAGMA for sqlite; the file is only
+	re-read when it changed) and numbers each change it finds. Readers ask
+	changes_since(seq) from any thread; that never touches the disk, so the
+	GUI can poll it from after() callbacks.
+	"""
+
+	def __init__(self, store, interval: float = WATCH_INTERVAL, history: int = 64):
+		self.store = store
+		self.interval = interval
+		self._log: "deque[Tuple[int, Optional[Set[str]]]]" = deque(maxlen=history)
+		self._seq = 0
+		self._lock = threading.Lock()
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+	def start(self) -> None:
+		if self._thread is None:
+			# Baseline: only changes after this point are reported
+			self.store.take_changes()
+			self._thread = threading.Thread(target=self._run, name="board-watcher", daemon=True)
+			self._thread.start()
+
+	def stop(self) -> None:
+		self._stop.set()
+
+	def _run(self) -> None:
+		while not self._stop.wait(self.interval):
+			try:
+				changed = self.store.take_changes()
+			except Exception:
+				# Lock timeout, file mid-replace on a network share...: try again next tick
+				continue
+			if changed is not None and not changed:
+				continue
+			with self._lock:
+				self._seq += 1
+				self._log.append((self._seq, changed))
+
+	def changes_since(self, seq: Optional[int]) -> Tuple[int, Optional[Set[str]]]:
+		"""(latest seq, board IDs changed after seq).
+
+		The IDs are None when they are not known (sqlite, or seq fell out of
+		the history); seq=None just returns the latest seq to start from.
+		"""
+		with self._lock:
+			if seq is None or seq >= self._seq:
+				return self._seq, set()
+			entries = [ids for n, ids in self._log if n > seq]
+			if len(entries) < self._seq - seq or any(ids is None for ids in entries):
+				return self._seq, None
+			return self._seq, set().union(*entries)
+
+
+_board_watcher: Optional[BoardWatcher] = None
+
+
+def board_changes(since: Optional[int] = None) -> Tuple[int, Optional[Set[str]]]:
+	"""BoardWatcher.changes_since on the shared store; starts the watcher on first use."""
+	global _board_watcher
+	if WATCH_INTERVAL <= 0:
+		return 0, set()
+	if _board_watcher is None:
+		_board_watcher = BoardWatcher(_board_store)
+		_board_watcher.start()
+	return _board_watcher.changes_since(since)
 
 
 def _ensure_employee_storage() -> None:
@@ -69,25 +1325,20 @@ def _ensure_employee_storage() -> None:
 
 
 def _load_employees() -> List[Dict]:
+	if isinstance(_board_store, SqliteStore):
+		return _board_store.load_employees()
 	_ensure_employee_storage()
-	emps: List[Dict] = []
-	with open(EMP_FILE, "r", encoding="utf-8") as f:
-		for line in f:
-			line = line.strip()
-			if not line:
-				continue
-			try:
-				emps.append(json.loads(line))
-			except json.JSONDecodeError:
-				continue
-	return emps
+	with open(EMP_FILE, "rb") as f:
+		emps, _end, trailing = _read_records(f)
+	return emps + [trailing] if trailing is not None else emps
 
 
 def _write_employees(emps: List[Dict]) -> None:
+	if isinstance(_board_store, SqliteStore):
+		_board_store.write_employees(emps)
+		return
 	_ensure_employee_storage()
-	with open(EMP_FILE, "w", encoding="utf-8") as f:
-		for e in emps:
-			f.write(json.dumps(e, ensure_ascii=False) + "\n")
+	_atomic_write_lines(EMP_FILE, map(JSON_CODEC.dump_line, emps))
 
 
 def find_employee(username: str) -> Optional[Dict]:
@@ -102,23 +1353,27 @@ def add_or_update_employee(username: str, password: str) -> Dict:
 		raise ValueError("Username and password are required")
 	if username == "admin":
 		raise ValueError("Cannot create or modify the built-in admin user")
-	emps = _load_employees()
-	# remove existing with same username
-	emps = [e for e in emps if str(e.get("username")) != str(username)]
-	new_emp = {"username": username, "password": password}
-	emps.append(new_emp)
-	_write_employees(emps)
+	# Read-modify-write under the writer lock, so concurrent saves from other
+	# workstations are not lost
+	with _file_lock(EMP_FILE):
+		emps = _load_employees()
+		# remove existing with same username
+		emps = [e for e in emps if str(e.get("username")) != str(username)]
+		new_emp = {"username": username, "password": password}
+		emps.append(new_emp)
+		_write_employees(emps)
 	return new_emp
 
 
 def delete_employee(username: str) -> bool:
 	if username == "admin":
 		return False
-	emps = _load_employees()
-	new_emps = [e for e in emps if str(e.get("username")) != str(username)]
-	if len(new_emps) == len(emps):
-		return False
-	_write_employees(new_emps)
+	with _file_lock(EMP_FILE):
+		emps = _load_employees()
+		new_emps = [e for e in emps if str(e.get("username")) != str(username)]
+		if len(new_emps) == len(emps):
+			return False
+		_write_employees(new_emps)
 	return True
 
 
@@ -126,13 +1381,175 @@ def list_employees() -> List[Dict]:
 	return _load_employees()
 
 
-def find_board_by_id(board_id: str) -> Optional[Dict]:
-	for b in _load_boards():
-		if str(b.get("board_id")) == str(board_id):
-			return b
+def _hash_file(path: str) -> str:
+	h = hashlib.sha256()
+	with open(path, "rb") as f:
+		for chunk in iter(lambda: f.read(PHOTO_HASH_CHUNK), b""):
+			h.update(chunk)
+	return h.hexdigest()
+
+
+def _touch_blob(path: str) -> None:
+	# Refresh the mtime so gc-photos treats it as recently used; a read-only
+	# or locked blob on a shared folder is still perfectly usable
+	try:
+		os.utime(path)
+	except OSError:
+		pass
+
+
+def _existing_blob(shard_dir: str, digest: str) -> Optional[str]:
+	# A blob with this content under any extension (.jpg/.jpeg/.JPG...)
+	try:
+		names = os.listdir(shard_dir)
+	except OSError:
+		return None
+	for name in names:
+		stem, ext = os.path.splitext(name)
+		if stem == digest and ext != ".tmp":
+			return os.path.join(shard_dir, name)
 	return None
 
 
+def _store_blob(src_path: str, ext: str) -> str:
+	# Returns the absolute blob path for the file's content, copying it only if
+	# new; the content hash alone decides, the extension only names new blobs
+	digest = _hash_file(src_path)
+	shard_dir = os.path.join(PHOTO_BLOBS_DIR, digest[:2])
+	existing = _existing_blob(shard_dir, digest)
+	if existing is not None:
+		_touch_blob(existing)
+		return existing
+	dest = os.path.join(shard_dir, digest + _BLOB_EXT_ALIASES.get(ext, ext))
+	os.makedirs(shard_dir, exist_ok=True)
+	tmp = f"{dest}.{os.getpid()}.tmp"
+	shutil.copyfile(src_path, tmp)
+	os.replace(tmp, dest)
+	return dest
+
+
+def _ingest_blob(src_path: str) -> Optional[str]:
+	# Downscaled/re-encoded copy of src_path as a blob; None if Pillow is
+	# missing or the file is not an image (the caller then stores it as-is).
+	# Named by the source hash plus settings, so the same photo is only
+	# decoded once per configuration.
+	try:
+		from PIL import Image, ImageOps  # Pillow
+	except ImportError:
+		return None
+	fmt = PHOTO_FORMAT if PHOTO_FORMAT in _PHOTO_EXT else "JPEG"
+	src_digest = _hash_file(src_path)
+	digest = hashlib.sha256(f"{src_digest}:{PHOTO_MAX_DIM}:{fmt}:{PHOTO_QUALITY}".encode("ascii")).hexdigest()
+	dest = os.path.join(PHOTO_BLOBS_DIR, digest[:2], digest + _PHOTO_EXT[fmt])
+	if os.path.exists(dest):
+		_touch_blob(dest)
+		return dest
+	tmp = f"{dest}.{os.getpid()}.tmp"
+	try:
+		with Image.open(src_path) as src:
+			if PHOTO_MAX_DIM > 0:
+				# JPEG sources decode at a reduced scale; no-op for other formats
+				src.draft("RGB", (PHOTO_MAX_DIM, PHOTO_MAX_DIM))
+			# Bake the EXIF orientation into the pixels before EXIF is dropped
+			img = ImageOps.exif_transpose(src)
+		if PHOTO_MAX_DIM > 0:
+			img.thumbnail((PHOTO_MAX_DIM, PHOTO_MAX_DIM), Image.LANCZOS)
+		if fmt == "JPEG" and img.mode != "RGB":
+			img = img.convert("RGB")
+		os.makedirs(os.path.dirname(dest), exist_ok=True)
+		# No exif= argument: metadata is not carried over
+		img.save(tmp, fmt, quality=PHOTO_QUALITY, optimize=True)
+		os.replace(tmp, dest)
+	except Exception:
+		try:
+			os.remove(tmp)
+		except OSError:
+			pass
+		return None
+	if PHOTO_KEEP_ORIGINAL:
+		_, ext = os.path.splitext(src_path)
+		orig = os.path.join(PHOTO_ORIGINALS_DIR, src_digest + (ext or "").lower())
+		if not os.path.exists(orig):
+			os.makedirs(PHOTO_ORIGINALS_DIR, exist_ok=True)
+			shutil.copyfile(src_path, orig)
+	return dest
+
+
+# Prepare photo paths: accept either source file paths or already-stored paths under pictures
+def _store_photo(src_path: Optional[str]) -> Optional[str]:
+	if not src_path:
+		return None
+	try:
+		# Stored photos are recorded relative to DATA_DIR
+		if not os.path.isabs(src_path) and os.path.exists(os.path.join(DATA_DIR, src_path)):
+			src_path = os.path.join(DATA_DIR, src_path)
+		# If already within PICTURES_DIR, keep as relative path
+		abs_src = os.path.abspath(src_path)
+		pics_abs = os.path.abspath(PICTURES_DIR)
+		if abs_src.startswith(pics_abs):
+			rel = os.path.relpath(abs_src, DATA_DIR)
+			return rel.replace("\\", "/")
+		return _store_new_photo(src_path)
+	except Exception:
+		return None
+
+
+def _store_new_photo(src_path: str) -> str:
+	# Store by content hash, through the ingest stage if enabled; returns the
+	# path relative to DATA_DIR and raises on I/O errors
+	dest_abs = _ingest_blob(src_path) if PHOTO_INGEST else None
+	if dest_abs is None:
+		_, ext = os.path.splitext(src_path)
+		dest_abs = _store_blob(src_path, (ext or "").lower())
+	rel = os.path.relpath(dest_abs, DATA_DIR)
+	return rel.replace("\\", "/")
+
+
+def photo_refcounts() -> Dict[str, int]:
+	# Stored photo path (relative to DATA_DIR) -> number of board fields using it
+	counts: Dict[str, int] = {}
+	for b in _board_store.all():
+		for key in ("before_photo", "after_photo"):
+			rel = b.get(key)
+			if rel:
+				rel = os.path.normpath(str(rel))
+				counts[rel] = counts.get(rel, 0) + 1
+	return counts
+
+
+def gc_photos(dry_run: bool = False) -> Tuple[int, int]:
+	"""
+	Delete photo blobs no board references, and the thumbnails of photos that
+	are gone or were replaced; returns (files, bytes) removed.
+	"""
+	refs = photo_refcounts()
+	cutoff = time.time() - float(PHOTO_GC_GRACE)
+	removed = freed = 0
+	for dirpath, _dirs, files in os.walk(PHOTO_BLOBS_DIR):
+		for name in files:
+			path = os.path.join(dirpath, name)
+			rel = os.path.normpath(os.path.relpath(path, DATA_DIR))
+			if refs.get(rel):
+				continue
+			try:
+				st = os.stat(path)
+				if st.st_mtime > cutoff:
+					continue
+				if not dry_run:
+					os.remove(path)
+			except OSError:
+				continue
+			removed += 1
+			freed += st.st_size
+	thumbs = ThumbnailCache(PHOTO_THUMBS_DIR)
+	n, size = thumbs.prune((os.path.join(DATA_DIR, rel) for rel in refs), dry_run=dry_run)
+	return removed + n, freed + size
+
+
+def find_board_by_id(board_id: str) -> Optional[Dict]:
+	return _board_store.get(board_id)
+
+
 def add_board(
 	board_id: str,
 	name: str,
@@ -156,33 +1573,10 @@ def add_board(
 ) -> Dict:
 	if not all([board_id, name, ic, dc, size]):
 		raise ValueError("All fields are required: board_id, name, ic, dc, size")
-	boards = _load_boards()
-	if any(str(b.get("board_id")) == str(board_id) for b in boards):
+	if _board_store.get(board_id) is not None:
 		raise ValueError(f"Board with ID '{board_id}' already exists")
-	# Prepare photo paths: accept either source file paths or already-stored paths under pictures
-	def _store_photo(src_path: Optional[str], tag: str) -> Optional[str]:
-		if not src_path:
-			return None
-		try:
-			# If already within PICTURES_DIR, keep as relative path
-			abs_src = os.path.abspath(src_path)
-			pics_abs = os.path.abspath(PICTURES_DIR)
-			if abs_src.startswith(pics_abs):
-				rel = os.path.relpath(abs_src, DATA_DIR)
-				return rel.replace("\\", "/")
-			# Otherwise, copy into pictures dir
-			_, ext = os.path.splitext(src_path)
-			ext = (ext or "").lower()
-			dest_name = f"{board_id}_{tag}{ext}"
-			dest_abs = os.path.join(PICTURES_DIR, dest_name)
-			shutil.copy2(src_path, dest_abs)
-			rel = os.path.relpath(dest_abs, DATA_DIR)
-			return rel.replace("\\", "/")
-		except Exception:
-			return None
-
-	before_rel = _store_photo(before_photo, "before")
-	after_rel = _store_photo(after_photo, "after")
+	before_rel = _store_photo(before_photo)
+	after_rel = _store_photo(after_photo)
 
 	# Merge: if pixel not provided, use size
 	pixel = pixel or size
@@ -207,24 +1601,731 @@ def add_board(
 		"issues": issues or {},
 		"created_by": created_by,
 	}
-	boards.append(board)
-	_write_boards(boards)
-	return board
+	# Re-checked under the write lock: another workstation may take the ID first
+	return _board_store.put([board], expected={str(board_id): None})[0]
 
 
 def list_boards() -> List[Dict]:
-	return _load_boards()
+	return _board_store.all()
+
+
+BOARD_FIELDS = (
+	"name", "ic", "dc", "size", "module_number", "pixel", "board_code",
+	"running_no", "running_no_p1", "running_no_p2", "date_request", "do_date",
+	"date_repair", "before_photo", "after_photo", "urgency", "issues", "created_by",
+)
+REQUIRED_FIELDS = ("name", "ic", "dc", "size")
+
+
+def _board_record(board_id: str, fields: Dict) -> Dict:
+	# Full record in add_board's field order; pixel defaults to size
+	board: Dict[str, Any] = {"board_id": str(board_id)}
+	for k in BOARD_FIELDS:
+		board[k] = fields.get(k)
+	board["pixel"] = board["pixel"] or board["size"]
+	board["urgency"] = bool(board["urgency"])
+	board["issues"] = board["issues"] or {}
+	return board
+
 
+def _patched(board: Dict, patch: Dict) -> Dict:
+	unknown = [k for k in patch if k not in BOARD_FIELDS]
+	if unknown:
+		raise ValueError(f"Unknown board field(s): {', '.join(unknown)}")
+	missing = [k for k in REQUIRED_FIELDS if k in patch and not patch[k]]
+	if missing:
+		raise ValueError(f"Fields cannot be empty: {', '.join(missing)}")
+	new_board = dict(board)
+	new_board.update(patch)
+	for key in ("before_photo", "after_photo"):
+		# Only store photos that actually changed; stored paths are kept as-is
+		if key in patch and patch[key] != board.get(key):
+			new_board[key] = _store_photo(patch[key])
+	if "urgency" in patch:
+		new_board["urgency"] = bool(patch["urgency"])
+	if "issues" in patch:
+		new_board["issues"] = patch["issues"] or {}
+	return new_board
+
+
+# A patch that was not pinned to a version is re-applied this often when
+# another workstation saves the same board between our read and our write
+PATCH_RETRIES = 3
+
+
+def update_boards_bulk(board_ids: List[str], patch: Dict, expected_versions: Optional[Dict[str, int]] = None) -> int:
+	"""Apply the same field patch to many boards with a single write.
+
+	expected_versions (board_id -> version the caller showed) turns a stale
+	copy into a ConflictError; without it the patch is applied to the latest
+	records, re-read and retried if they change underneath.
+	"""
+	for attempt in range(PATCH_RETRIES):
+		updated = []
+		expected: Dict[str, Optional[int]] = {}
+		for bid in dict.fromkeys(str(i) for i in board_ids):
+			b = _board_store.get(bid)
+			if b is None:
+				continue
+			expected[bid] = _record_version(b)
+			updated.append(_patched(b, patch))
+		if expected_versions:
+			expected.update({str(k): v for k, v in expected_versions.items() if str(k) in expected})
+		if not updated:
+			return 0
+		try:
+			_board_store.put(updated, expected=expected)
+			return len(updated)
+		except ConflictError:
+			if expected_versions or attempt == PATCH_RETRIES - 1:
+				raise
+	return 0
+
+
+def update_board(board_id: str, expected_version: Optional[int] = None, **fields) -> Optional[Dict]:
+	# expected_version: see update_boards_bulk; None when the board is gone
+	for attempt in range(PATCH_RETRIES):
+		b = _board_store.get(board_id)
+		if b is None:
+			if expected_version is not None:
+				raise ConflictError([(str(board_id), "was deleted by someone else")])
+			return None
+		new_board = _patched(b, fields)
+		base = _record_version(b) if expected_version is None else expected_version
+		try:
+			return _board_store.put([new_board], expected={str(board_id): base})[0]
+		except ConflictError:
+			if expected_version is not None or attempt == PATCH_RETRIES - 1:
+				raise
+	return None
 
-def delete_board(board_id: str) -> bool:
-	boards = _load_boards()
-	new_boards = [b for b in boards if str(b.get("board_id")) != str(board_id)]
-	if len(new_boards) == len(boards):
+
+def delete_board(board_id: str, expected_version: Optional[int] = None) -> bool:
+	# With expected_version, refuse (ConflictError) if the board was saved since
+	expected = None if expected_version is None else {str(board_id): expected_version}
+	return _board_store.remove([board_id], expected=expected) > 0
+
+
+def compact_boards() -> int:
+	return _board_store.compact()
+
+
+def query_boards(
+	site: Optional[str] = None,
+	size: Optional[str] = None,
+	created_by: Optional[str] = None,
+	urgency: Optional[bool] = None,
+	months: Optional[List[int]] = None,
+	text: Optional[str] = None,
+	sort: Optional[str] = None,
+	limit: Optional[int] = None,
+	offset: int = 0,
+) -> List[Dict]:
+	# None means "no filter"; months are 1-12 of date_request; text is a
+	# case-insensitive substring of SEARCH_FIELDS; sort is a field name,
+	# "-field" for descending
+	return _board_store.query(
+		site=site, size=size, created_by=created_by, urgency=urgency, months=months,
+		text=text, sort=sort, limit=limit, offset=offset,
+	)
+
+
+def board_fits_query(
+	old: Dict,
+	new: Dict,
+	site: Optional[str] = None,
+	size: Optional[str] = None,
+	created_by: Optional[str] = None,
+	urgency: Optional[bool] = None,
+	months: Optional[List[int]] = None,
+	text: Optional[str] = None,
+	sort: Optional[str] = None,
+	**_paging,
+) -> bool:
+	"""True if new (an edited old) still belongs where old was in a query_boards result.
+
+	It must still pass the filters and search text, and keep its sort key;
+	then swapping it in place leaves the result as a fresh query would return it.
+	"""
+	if site is not None and str(new.get("name")) != site:
+		return False
+	if size is not None and str(new.get("size")) != size:
 		return False
-	_write_boards(new_boards)
+	if created_by is not None and str(new.get("created_by")) != created_by:
+		return False
+	if urgency is not None and bool(new.get("urgency", False)) != urgency:
+		return False
+	if months and _request_month(new) not in set(months):
+		return False
+	needle = (text or "").strip().lower()
+	if needle and needle not in _search_text(new):
+		return False
+	field, _reverse = _parse_sort(sort)
+	if field:
+		key = _sort_key(field)
+		return key(old) == key(new)
+	# Unsorted results keep insertion order, which an update does not change
 	return True
 
 
+def distinct_board_values(field: str) -> List[str]:
+	return _board_store.distinct(field)
+
+
+def iter_boards(**filters) -> Iterator[Dict]:
+	# Same filters as query_boards, but yields records as they are read
+	return _board_store.iter_query(**filters)
+
+
+# Photo file name tags understood by import-photos
+PHOTO_TAGS = {"before": "before_photo", "after": "after_photo"}
+
+
+def _photo_pattern(pattern: str) -> "re.Pattern":
+	# "{board_id}_{tag}.*" -> regex over file names; * and ? are wildcards
+	if "{board_id}" not in pattern or "{tag}" not in pattern:
+		raise ValueError("Pattern must contain {board_id} and {tag}")
+	parts = []
+	for part in re.split(r"(\{board_id\}|\{tag\}|\*|\?)", pattern):
+		if part == "{board_id}":
+			parts.append(r"(?P<board_id>.+?)")
+		elif part == "{tag}":
+			parts.append(r"(?P<tag>[A-Za-z]+)")
+		elif part == "*":
+			parts.append(".*")
+		elif part == "?":
+			parts.append(".")
+		else:
+			parts.append(re.escape(part))
+	return re.compile("".join(parts) + r"\Z", re.IGNORECASE)
+
+
+def _import_photo_worker(src_path: str) -> Tuple[Optional[str], Optional[str]]:
+	# Runs in a pool process: (stored path, None) or (None, error message)
+	try:
+		return _store_new_photo(src_path), None
+	except Exception as e:
+		return None, f"{type(e).__name__}: {e}"
+
+
+def _worker_pool(workers: Optional[int] = None) -> Executor:
+	# Process pool for CPU-bound batch jobs. A frozen (PyInstaller) exe uses
+	# threads instead: spawned children there re-run the exe, and Pillow
+	# releases the GIL while decoding/encoding anyway.
+	if getattr(sys, "frozen", False):
+		return ThreadPoolExecutor(max_workers=workers or os.cpu_count())
+	return ProcessPoolExecutor(max_workers=workers)
+
+
+def import_photos(
+	directory: str,
+	pattern: str = "{board_id}_{tag}.*",
+	create: Optional[Dict] = None,
+	workers: Optional[int] = None,
+	progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict:
+	"""Attach photos from a folder to boards by file name.
+
+	Files matching pattern are hashed/resized/stored on a worker pool and all
+	touched boards are written in one batch at the end. Photos for unknown
+	boards are errors unless create holds the fields (name, ic, dc, size, ...)
+	for new boards. progress(done, total) is called as files finish.
+	Returns counts plus a list of (file name, error) pairs.
+	"""
+	rx = _photo_pattern(pattern)
+	if create is not None:
+		missing = [k for k in REQUIRED_FIELDS if not create.get(k)]
+		if missing:
+			raise ValueError(f"Fields required to create boards: {', '.join(missing)}")
+	errors: List[Tuple[str, str]] = []
+	jobs: Dict[str, Tuple[str, str]] = {}
+	first: Dict[Tuple[str, str], str] = {}
+	unmatched = 0
+	for name in sorted(os.listdir(directory)):
+		path = os.path.join(directory, name)
+		if not os.path.isfile(path):
+			continue
+		m = rx.match(name)
+		if not m:
+			unmatched += 1
+			continue
+		bid, tag = m.group("board_id"), m.group("tag").lower()
+		field = PHOTO_TAGS.get(tag)
+		if field is None:
+			errors.append((name, f"unknown tag '{tag}' (expected {' or '.join(PHOTO_TAGS)})"))
+			continue
+		if create is None and _board_store.get(bid) is None:
+			errors.append((name, f"no board with ID '{bid}'"))
+			continue
+		if (bid, field) in first:
+			errors.append((name, f"duplicate {tag} photo for board '{bid}', using {first[(bid, field)]}"))
+			continue
+		first[(bid, field)] = name
+		jobs[path] = (bid, field)
+
+	total = len(jobs)
+	stored: Dict[str, Dict[str, str]] = {}
+	if progress:
+		progress(0, total)
+	if jobs:
+		with _worker_pool(workers) as pool:
+			futures = {pool.submit(_import_photo_worker, path): path for path in jobs}
+			for done, fut in enumerate(as_completed(futures), start=1):
+				path = futures[fut]
+				bid, field = jobs[path]
+				try:
+					rel, err = fut.result()
+				except Exception as e:
+					rel, err = None, f"{type(e).__name__}: {e}"
+				if rel is None:
+					errors.append((os.path.basename(path), err or "could not store photo"))
+				else:
+					stored.setdefault(bid, {})[field] = rel
+				if progress:
+					progress(done, total)
+
+	boards = []
+	expected: Dict[str, Optional[int]] = {}
+	created = 0
+	for bid, fields in list(stored.items()):
+		b = _board_store.get(bid)
+		if b is None and create is None:
+			# Deleted since the scan; only create boards when asked to
+			del stored[bid]
+			for path, (job_bid, field) in jobs.items():
+				if job_bid == bid and field in fields:
+					errors.append((os.path.basename(path), f"board '{bid}' was deleted during the import"))
+			continue
+		if b is None:
+			b = _board_record(bid, create)
+			expected[bid] = None
+			created += 1
+		else:
+			expected[bid] = _record_version(b)
+			b = dict(b)
+		b.update(fields)
+		boards.append(b)
+	if boards:
+		_board_store.put(boards, expected=expected)
+	return {
+		"files": total,
+		"stored": sum(len(f) for f in stored.values()),
+		"boards": len(boards),
+		"created": created,
+		"unmatched": unmatched,
+		"errors": errors,
+	}
+
+
+IMPORT_FORMATS = ("csv", "jsonl", "xlsx")
+# Flattened issue columns: "issue.<name>" holds the count (or flag) for one issue
+ISSUE_COLUMN_PREFIX = "issue."
+
+
+def _iter_import_rows(path: str, fmt: str) -> Iterator[Tuple[int, Any]]:
+	# Yields (row number, dict) per data row, or (row number, error text)
+	if fmt == "csv":
+		with open(path, "r", encoding="utf-8-sig", newline="") as f:
+			for n, row in enumerate(csv.DictReader(f), start=2):
+				yield n, row
+	elif fmt == "jsonl":
+		with open(path, "r", encoding="utf-8") as f:
+			for n, line in enumerate(f, start=1):
+				line = line.strip()
+				if not line:
+					continue
+				try:
+					row = json.loads(line)
+				except json.JSONDecodeError as e:
+					yield n, f"invalid JSON: {e}"
+					continue
+				yield n, row if isinstance(row, dict) else "not a JSON object"
+	elif fmt == "xlsx":
+		try:
+			from openpyxl import load_workbook  # type: ignore
+		except ImportError:
+			raise ValueError("XLSX import needs openpyxl (pip install openpyxl)")
+		wb = load_workbook(path, read_only=True, data_only=True)
+		try:
+			rows = wb.active.iter_rows(values_only=True)
+			header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+			for n, values in enumerate(rows, start=2):
+				if all(v is None for v in values):
+					continue
+				yield n, dict(zip(header, values))
+		finally:
+			wb.close()
+	else:
+		raise ValueError(f"Unsupported import format '{fmt}' (use {', '.join(IMPORT_FORMATS)})")
+
+
+def _cell_text(value: Any) -> Optional[str]:
+	# Spreadsheet cells come back as numbers/dates; store them as the text the user typed
+	if value is None:
+		return None
+	if isinstance(value, float) and value.is_integer():
+		value = int(value)
+	elif isinstance(value, datetime.datetime):
+		value = value.date()
+	if isinstance(value, datetime.date):
+		return value.isoformat()
+	text = str(value).strip()
+	return text or None
+
+
+def _cell_bool(value: Any) -> bool:
+	if isinstance(value, str):
+		return value.strip().lower() in ("1", "true", "yes", "y", "x", "✔")
+	return bool(value)
+
+
+def _board_from_row(row: Dict, created_by: Optional[str]) -> Dict:
+	# Validated board record for one import row; raises ValueError
+	clean = {str(k).strip(): v for k, v in row.items() if k is not None and str(k).strip()}
+	bid = _cell_text(clean.get("board_id"))
+	if not bid:
+		raise ValueError("missing board_id")
+	missing = [k for k in REQUIRED_FIELDS if not _cell_text(clean.get(k))]
+	if missing:
+		raise ValueError(f"missing {', '.join(missing)}")
+	fields: Dict[str, Any] = {}
+	for k in BOARD_FIELDS:
+		if k not in ("urgency", "issues"):
+			fields[k] = _cell_text(clean.get(k))
+	fields["urgency"] = _cell_bool(clean.get("urgency"))
+	issues = clean.get("issues")
+	if isinstance(issues, str) and issues.strip():
+		try:
+			issues = json.loads(issues)
+		except json.JSONDecodeError:
+			raise ValueError("issues is not valid JSON")
+	issues = dict(issues) if isinstance(issues, dict) else {}
+	for k, v in clean.items():
+		if k.startswith(ISSUE_COLUMN_PREFIX) and v not in (None, ""):
+			# Dotted names are nested issue groups, as written by export
+			*groups, name = k[len(ISSUE_COLUMN_PREFIX):].split(".")
+			target = issues
+			for g in groups:
+				target = target.setdefault(g, {})
+				if not isinstance(target, dict):
+					raise ValueError(f"{k} conflicts with another issue column")
+			if name in ("no_issue", "total_loss"):
+				target[name] = _cell_bool(v)
+			else:
+				try:
+					target[name] = int(float(v))
+				except (TypeError, ValueError):
+					raise ValueError(f"{k} is not a number")
+	fields["issues"] = issues
+	if created_by:
+		fields["created_by"] = created_by
+	# Photo paths are stored by import_boards once all rows are validated
+	return _board_record(bid, fields)
+
+
+def import_boards(path: str, fmt: Optional[str] = None, created_by: Optional[str] = None) -> Tuple[int, List[Tuple[int, str]]]:
+	"""Add boards from a CSV, JSONL or XLSX file in one write.
+
+	Rows are streamed and validated like add_board (required fields, no
+	existing or repeated board_id); rejected rows are skipped and returned as
+	(row number, reason). Columns are board field names; issues may be a
+	JSON object or "issue.<name>" columns. Returns (added, rejected).
+	"""
+	fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+	if fmt == "json":
+		fmt = "jsonl"
+	# Parse and validate without touching the store, then check all IDs in
+	# one lookup and store the photos of the accepted rows
+	candidates: List[Tuple[int, Dict]] = []
+	seen = set()
+	rejected: List[Tuple[int, str]] = []
+	for n, row in _iter_import_rows(path, fmt):
+		if isinstance(row, str):
+			rejected.append((n, row))
+			continue
+		try:
+			board = _board_from_row(row, created_by)
+		except ValueError as e:
+			rejected.append((n, str(e)))
+			continue
+		bid = board["board_id"]
+		if bid in seen:
+			rejected.append((n, f"duplicate board_id '{bid}' in file"))
+			continue
+		seen.add(bid)
+		candidates.append((n, board))
+	taken = _board_store.existing(seen) if seen else set()
+	boards: List[Dict] = []
+	photos: Dict[str, Optional[str]] = {}
+	for n, board in candidates:
+		bid = board["board_id"]
+		if bid in taken:
+			rejected.append((n, f"board_id '{bid}' already exists"))
+			continue
+		for key in ("before_photo", "after_photo"):
+			src = board[key]
+			if src:
+				# The same file named on many rows is hashed/copied once
+				if src not in photos:
+					photos[src] = _store_photo(src)
+				board[key] = photos[src]
+		boards.append(board)
+	rejected.sort(key=lambda r: r[0])
+	if boards:
+		_board_store.put(boards, expected={b["board_id"]: None for b in boards})
+	return len(boards), rejected
+
+
+EXPORT_FORMATS = IMPORT_FORMATS
+# Export columns before the flattened issue.<name> ones
+EXPORT_COLUMNS = ("board_id",) + tuple(f for f in BOARD_FIELDS if f != "issues")
+
+
+def _export_value(value: Any) -> Any:
+	if value is None:
+		return ""
+	if isinstance(value, (dict, list)):
+		return json.dumps(value, ensure_ascii=False)
+	return value
+
+
+def _flat_issues(issues: Dict, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+	# Nested issue groups become dotted names: {"with_mask": {"glue": 1}} -> "with_mask.glue"
+	for k, v in issues.items():
+		if isinstance(v, dict):
+			yield from _flat_issues(v, f"{prefix}{k}.")
+		else:
+			yield f"{prefix}{k}", v
+
+
+def export_boards(path: str, fmt: str, **filters) -> int:
+	"""Write the boards matching filters (as query_boards) to path; returns the count.
+
+	Records are streamed from the store, so memory does not grow with the
+	inventory. JSONL keeps each record as stored; CSV and XLSX get one column
+	per field plus one issue.<name> column per issue key found (one extra
+	pass to collect the key names). XLSX uses openpyxl's write-only mode.
+	"""
+	fmt = fmt.lower()
+	if fmt not in EXPORT_FORMATS:
+		raise ValueError(f"Unsupported export format '{fmt}' (use {', '.join(EXPORT_FORMATS)})")
+	if fmt == "jsonl":
+		count = 0
+		with open(path, "w", encoding="utf-8") as f:
+			for b in iter_boards(**filters):
+				f.write(json.dumps(b, ensure_ascii=False) + "\n")
+				count += 1
+		return count
+
+	issue_keys: Dict[str, None] = {}
+	for b in iter_boards(**filters):
+		for k, _v in _flat_issues(b.get("issues") or {}):
+			issue_keys.setdefault(k, None)
+	header = list(EXPORT_COLUMNS) + [ISSUE_COLUMN_PREFIX + k for k in issue_keys]
+
+	def rows() -> Iterator[List]:
+		for b in iter_boards(**filters):
+			issues = dict(_flat_issues(b.get("issues") or {}))
+			yield [_export_value(b.get(c)) for c in EXPORT_COLUMNS] + [_export_value(issues.get(k)) for k in issue_keys]
+
+	count = 0
+	if fmt == "csv":
+		with open(path, "w", encoding="utf-8-sig", newline="") as f:
+			writer = csv.writer(f)
+			writer.writerow(header)
+			for row in rows():
+				writer.writerow(row)
+				count += 1
+		return count
+	try:
+		from openpyxl import Workbook  # type: ignore
+	except ImportError:
+		raise ValueError("XLSX export needs openpyxl (pip install openpyxl)")
+	wb = Workbook(write_only=True)
+	ws = wb.create_sheet("Boards")
+	ws.append(header)
+	for row in rows():
+		ws.append(row)
+		count += 1
+	wb.save(path)
+	return count
+
+
+def _parse_filters(items: List[str]) -> Dict:
+	# CLI "key=value" filters -> query_boards keyword arguments
+	filters: Dict[str, Any] = {}
+	for item in items or ():
+		key, sep, value = item.partition("=")
+		key = key.strip().lower()
+		value = value.strip()
+		if not sep or not key:
+			raise ValueError(f"Filter '{item}' must look like key=value")
+		if key in ("site", "name"):
+			filters["site"] = value
+		elif key in ("size", "created_by", "text"):
+			filters[key] = value
+		elif key == "urgency":
+			filters["urgency"] = _cell_bool(value)
+		elif key in ("month", "months"):
+			try:
+				filters["months"] = [int(m) for m in value.split(",") if m.strip()]
+			except ValueError:
+				raise ValueError(f"Filter '{item}': months are numbers 1-12")
+		else:
+			raise ValueError(f"Unknown filter '{key}' (use site, size, created_by, urgency, months, text)")
+	return filters
+
+
+# Board fields a batch of quotations can be split by; date_request splits by month
+QUOTE_GROUP_FIELDS = ("name", "size", "pixel", "board_code", "created_by", "date_request")
+QUOTE_MANIFEST = "manifest.csv"
+
+
+def _quote_group_value(board: Dict, field: str) -> str:
+	if field == "date_request":
+		# "YYYY-MM-DD" -> "YYYY-MM"
+		return str(board.get(field))[:7] if _request_month(board) else ""
+	return str(board.get(field) or "").strip()
+
+
+def _quote_file_part(value: str) -> str:
+	return re.sub(r"[^A-Za-z0-9._-]+", "-", value).strip("-.") or "none"
+
+
+def _quote_date(boards: List[Dict]) -> str:
+	# Earliest date_request of the group, in the quotation dialog's dd/mm/yyyy
+	dates = []
+	for b in boards:
+		try:
+			dates.append(datetime.date.fromisoformat(str(b.get("date_request"))))
+		except ValueError:
+			pass
+	return (min(dates) if dates else datetime.date.today()).strftime("%d/%m/%Y")
+
+
+def _quote_worker(path: str, rows: List, meta: Dict, boards: Dict[str, Dict]) -> Optional[str]:
+	# Runs in a pool process: None when written, else the error message
+	try:
+		from quotation_export import export_quotation_xlsx
+		export_quotation_xlsx(path, rows, meta, boards)
+		return None
+	except Exception as e:
+		return f"{type(e).__name__}: {e}"
+
+
+def batch_quotations(
+	out_dir: str,
+	group_by: Tuple[str, ...] = ("name", "date_request"),
+	board_ids: Optional[List[str]] = None,
+	start_id: int = 1,
+	workers: Optional[int] = None,
+	progress: Optional[Callable[[int, int], None]] = None,
+	**filters,
+) -> Dict:
+	"""Write one quotation workbook per group of boards into out_dir.
+
+	Boards matching filters (as query_boards), restricted to board_ids when
+	given, are grouped by the group_by fields (QUOTE_GROUP_FIELDS) and each
+	group becomes a quotation with the Quotations page layout, one row per
+	board. Quotation IDs are numbered from start_id in group order. The
+	workbooks are rendered on a worker pool; progress(done, total) is called
+	as they finish. A manifest.csv lists every quotation with its file,
+	group values and board IDs.
+	Returns counts, the manifest path and a list of (file name, error) pairs.
+	"""
+	try:
+		import openpyxl  # type: ignore  # noqa: F401
+	except ImportError:
+		raise ValueError("Quotation export needs openpyxl (pip install openpyxl)")
+	from quotation_export import quote_row
+	group_by = tuple(group_by)
+	unknown = [f for f in group_by if f not in QUOTE_GROUP_FIELDS]
+	if not group_by or unknown:
+		raise ValueError(f"Group by one or more of {', '.join(QUOTE_GROUP_FIELDS)}")
+	wanted = None if board_ids is None else {str(b) for b in board_ids}
+	groups: Dict[Tuple[str, ...], List[Dict]] = {}
+	for b in iter_boards(**filters):
+		if wanted is not None and str(b.get("board_id")) not in wanted:
+			continue
+		groups.setdefault(tuple(_quote_group_value(b, f) for f in group_by), []).append(b)
+
+	os.makedirs(out_dir, exist_ok=True)
+	jobs: Dict[str, Tuple] = {}
+	entries: List[Dict] = []
+	for qid, key in enumerate(sorted(groups), start=start_id):
+		boards = groups[key]
+		values = dict(zip(group_by, key))
+		first = boards[0]
+		meta = {
+			"quotation_id": str(qid),
+			"project_name": values.get("name", first.get("name") or ""),
+			"project_code": "",
+			"modules_code": "",
+			"total_repair_modules": str(len(boards)),
+			"date_request": _quote_date(boards),
+			"pixel": str(first.get("pixel") or first.get("size") or ""),
+		}
+		name = "_".join(["quotation", str(qid)] + [_quote_file_part(v) for v in key]) + ".xlsx"
+		rows = [quote_row(b) for b in boards]
+		jobs[os.path.join(out_dir, name)] = (rows, meta, {str(b.get("board_id")): b for b in boards})
+		entries.append({"quotation_id": qid, "file": name, "values": key, "boards": boards})
+
+	total = len(jobs)
+	failed: Dict[str, str] = {}
+	if progress:
+		progress(0, total)
+	if jobs:
+		with _worker_pool(workers) as pool:
+			futures = {pool.submit(_quote_worker, path, *job): path for path, job in jobs.items()}
+			for done, fut in enumerate(as_completed(futures), start=1):
+				path = futures[fut]
+				try:
+					err = fut.result()
+				except Exception as e:
+					err = f"{type(e).__name__}: {e}"
+				if err:
+					failed[os.path.basename(path)] = err
+				if progress:
+					progress(done, total)
+
+	manifest = os.path.join(out_dir, QUOTE_MANIFEST)
+	with open(manifest, "w", encoding="utf-8-sig", newline="") as f:
+		writer = csv.writer(f)
+		writer.writerow(["quotation_id", "file"] + list(group_by) + ["boards", "board_ids", "error"])
+		for e in entries:
+			writer.writerow(
+				[e["quotation_id"], e["file"]] + list(e["values"])
+				+ [len(e["boards"]), " ".join(str(b.get("board_id")) for b in e["boards"]), failed.get(e["file"], "")]
+			)
+	return {
+		"quotations": total - len(failed),
+		"boards": sum(len(e["boards"]) for e in entries),
+		"manifest": manifest,
+		"errors": sorted(failed.items()),
+	}
+
+
+def migrate_to_sqlite(db_path: Optional[str] = None) -> Tuple[int, int]:
+	# One-shot copy of the JSONL note files into the SQLite database
+	src = BoardStore(NOTE_FILE, journal=True)
+	dst = SqliteStore(db_path or DB_FILE)
+	boards = src.all()
+	dst.replace_all(boards)
+	emps: List[Dict] = []
+	if os.path.exists(EMP_FILE):
+		with open(EMP_FILE, "r", encoding="utf-8") as f:
+			for line in f:
+				line = line.strip()
+				if not line:
+					continue
+				try:
+					emps.append(json.loads(line))
+				except json.JSONDecodeError:
+					continue
+	dst.write_employees(emps)
+	return len(boards), len(emps)
+
+
 def show_board(board_id: str) -> Optional[Dict]:
 	return find_board_by_id(board_id)
 
@@ -261,6 +2362,53 @@ def main():
 	p_del = subparsers.add_parser("delete", help="Delete a board by ID")
 	p_del.add_argument("--id", required=True, help="Board ID to delete")
 
+	# search command
+	p_search = subparsers.add_parser("search", help="Search boards by ID, name, running no, size or board code")
+	p_search.add_argument("--q", required=True, help="Text to look for (case-insensitive substring)")
+	p_search.add_argument("--limit", type=int, default=None, help="Show at most this many matches")
+
+	# compact command
+	subparsers.add_parser("compact", help="Rewrite the note file without replaced/deleted records")
+
+	# import command
+	p_import = subparsers.add_parser("import", help="Add boards from a CSV, JSONL or XLSX file")
+	p_import.add_argument("--file", required=True, help="File to import (columns are board field names)")
+	p_import.add_argument("--format", choices=IMPORT_FORMATS, default=None, help="File format (default: from the extension)")
+	p_import.add_argument("--created-by", default=None, help='Record this user as "Added by" for every board')
+
+	# export command
+	p_export = subparsers.add_parser("export", help="Export boards to CSV, JSONL or XLSX")
+	p_export.add_argument("--format", choices=EXPORT_FORMATS, required=True, help="Output format")
+	p_export.add_argument("--out", default=None, help="Output file (default: boards_export.<format>)")
+	p_export.add_argument("--filter", action="append", default=[], metavar="KEY=VALUE", help="site, size, created_by, urgency, months (e.g. 1,2,3) or text; repeatable")
+	p_export.add_argument("--sort", default=None, help='Sort field; use --sort=-field for descending')
+
+	# import-photos command
+	p_imp = subparsers.add_parser("import-photos", help="Attach photos in a folder to boards by file name")
+	p_imp.add_argument("--dir", required=True, help="Folder with the photos")
+	p_imp.add_argument("--pattern", default="{board_id}_{tag}.*", help='File name pattern, tag is before/after (default "{board_id}_{tag}.*")')
+	p_imp.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+	p_imp.add_argument("--create", action="store_true", help="Create boards that do not exist yet (needs --name, --ic, --dc, --size)")
+	p_imp.add_argument("--name", help="Site name for created boards")
+	p_imp.add_argument("--ic", help="IC for created boards")
+	p_imp.add_argument("--dc", help="DC for created boards")
+	p_imp.add_argument("--size", help="Size for created boards")
+
+	# gc-photos command
+	p_gc = subparsers.add_parser("gc-photos", help="Delete stored photos that no board references")
+	p_gc.add_argument("--dry-run", action="store_true", help="Only report what would be deleted")
+
+	# quote command
+	p_quote = subparsers.add_parser("quote", help="Write one quotation workbook per site/month (or other grouping)")
+	p_quote.add_argument("--group-by", default="name,date_request", help=f"Comma-separated fields: {', '.join(QUOTE_GROUP_FIELDS)} (date_request groups by month; default name,date_request)")
+	p_quote.add_argument("--out", required=True, help="Output folder for the workbooks and manifest.csv")
+	p_quote.add_argument("--filter", action="append", default=[], metavar="KEY=VALUE", help="Only quote matching boards, as for export; repeatable")
+	p_quote.add_argument("--start-id", type=int, default=1, help="First quotation number (default 1)")
+	p_quote.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+
+	# migrate-sqlite command
+	subparsers.add_parser("migrate-sqlite", help="Copy boards and employees from the JSONL files into the SQLite database")
+
 	# gui command
 	subparsers.add_parser("gui", help="Launch the GUI application")
 
@@ -277,6 +2425,14 @@ def main():
 			list_boards=list_boards,
 			add_board=add_board,
 			delete_board=delete_board,
+			update_board=update_board,
+			update_boards_bulk=update_boards_bulk,
+			query_boards=query_boards,
+			distinct_board_values=distinct_board_values,
+			import_photos=import_photos,
+			batch_quotations=batch_quotations,
+			board_changes=board_changes,
+			board_fits_query=board_fits_query,
 			find_board_by_id=find_board_by_id,
 			find_employee=find_employee,
 			list_employees=list_employees,
@@ -308,12 +2464,84 @@ def main():
 				print(f"Deleted board ID '{args.id}'.")
 			else:
 				print(f"Board ID '{args.id}' not found.")
+		elif args.command == "search":
+			boards = query_boards(text=args.q, limit=args.limit)
+			if not boards:
+				print(f"No boards match '{args.q}'.")
+			else:
+				for b in boards:
+					_print_board(b)
+		elif args.command == "compact":
+			dropped = compact_boards()
+			print(f"Compacted note file: removed {dropped} dead record(s).")
+		elif args.command == "import":
+			added, rejected = import_boards(args.file, args.format, created_by=args.created_by)
+			print(f"Imported {added} board(s); {len(rejected)} row(s) rejected.")
+			for n, reason in rejected[:50]:
+				print(f"  row {n}: {reason}")
+			if len(rejected) > 50:
+				print(f"  ... and {len(rejected) - 50} more")
+		elif args.command == "export":
+			out = args.out or f"boards_export.{args.format}"
+			count = export_boards(out, args.format, sort=args.sort, **_parse_filters(args.filter))
+			print(f"Exported {count} board(s) to {out}.")
+		elif args.command == "import-photos":
+			create = None
+			if args.create:
+				create = {"name": args.name, "ic": args.ic, "dc": args.dc, "size": args.size}
+
+			def report(done: int, total: int) -> None:
+				print(f"\rStoring photos: {done}/{total}", end="", flush=True)
+
+			res = import_photos(args.dir, args.pattern, create=create, workers=args.workers, progress=report)
+			print()
+			print(
+				f"Stored {res['stored']} photo(s) on {res['boards']} board(s)"
+				f" ({res['created']} created); {res['unmatched']} file(s) did not match the pattern."
+			)
+			if res["errors"]:
+				print(f"{len(res['errors'])} error(s):")
+				for name, err in res["errors"]:
+					print(f"  {name}: {err}")
+		elif args.command == "quote":
+			group_by = tuple(f.strip() for f in args.group_by.split(",") if f.strip())
+
+			def report(done: int, total: int) -> None:
+				print(f"\rWriting quotations: {done}/{total}", end="", flush=True)
+
+			res = batch_quotations(
+				args.out, group_by, start_id=args.start_id, workers=args.workers,
+				progress=report, **_parse_filters(args.filter),
+			)
+			print()
+			print(f"Wrote {res['quotations']} quotation(s) for {res['boards']} board(s); manifest: {res['manifest']}")
+			if res["errors"]:
+				print(f"{len(res['errors'])} error(s):")
+				for name, err in res["errors"]:
+					print(f"  {name}: {err}")
+		elif args.command == "gc-photos":
+			removed, freed = gc_photos(dry_run=args.dry_run)
+			verb = "Would remove" if args.dry_run else "Removed"
+			print(f"{verb} {removed} unreferenced photo/thumbnail file(s), {freed / (1024 * 1024):.1f} MB.")
+		elif args.command == "migrate-sqlite":
+			n_boards, n_emps = migrate_to_sqlite()
+			print(f"Migrated {n_boards} board(s) and {n_emps} employee(s) to {DB_FILE}.")
+			if STORAGE_BACKEND != "sqlite":
+				print('Set "storage_backend": "sqlite" in config.json to use it.')
 		elif args.command == "gui":
 			from login_gui import run_gui as _run_gui
 			_run_gui(
 				list_boards=list_boards,
 				add_board=add_board,
 				delete_board=delete_board,
+				update_board=update_board,
+				update_boards_bulk=update_boards_bulk,
+				query_boards=query_boards,
+				distinct_board_values=distinct_board_values,
+				import_photos=import_photos,
+				batch_quotations=batch_quotations,
+				board_changes=board_changes,
+				board_fits_query=board_fits_query,
 				find_board_by_id=find_board_by_id,
 				find_employee=find_employee,
 				list_employees=list_employees,
@@ -377,4 +2605,6 @@ def run_interactive():
 
 
 if __name__ == "__main__":
+	# Worker processes of a frozen exe start here too; let them run their task
+	multiprocessing.freeze_support()
 	main()
@@ -0,0 +1,128 @@
+"""
+Load/save throughput of the note file JSON codecs.
+
+Writes N synthetic boards with every available codec (orjson, ujson, the
+stdlib) through the same path the app uses (_atomic_write_lines, then
+_read_records), plus the previous line-by-line stdlib code as a baseline.
+
+    python bench_codec.py
+    python bench_codec.py --sizes 10000,100000 --codecs orjson,json
+
+Files go to a temporary folder; the data folder is not touched. 1M boards
+need a few GB of memory.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import Main
+
+
+def synthetic_boards(n: int) -> list:
+    sites = [f"Site {i:03d}" for i in range(200)]
+    sizes = ["320x160", "256x128", "192x192", "160x80"]
+    issue_names = ["caterpillar", "lamp pixel drop", "kaki patah", "RGB line", "module blackout"]
+    boards = []
+    for i in range(n):
+        month = i % 12 + 1
+        boards.append({
+            "board_id": str(100000 + i),
+            "name": sites[i % len(sites)],
+            "ic": "SM1627P",
+            "dc": "74HC 368",
+            "size": sizes[i % len(sizes)],
+            "module_number": str(i % 400),
+            "pixel": "P4",
+            "board_code": f"BC-{i:07d}",
+            "running_no": str(i),
+            "running_no_p1": str(i // 1000),
+            "running_no_p2": str(i % 1000),
+            "date_request": f"2025-{month:02d}-{i % 28 + 1:02d}",
+            "do_date": None,
+            "date_repair": None,
+            "before_photo": f"pictures/blobs/{i:064x}.jpg" if i % 3 == 0 else None,
+            "after_photo": None,
+            "urgency": i % 10 == 0,
+            "issues": {name: (i + k) % 4 for k, name in enumerate(issue_names)},
+            "created_by": f"tech{i % 7}",
+            Main.VERSION_KEY: 1,
+        })
+    return boards
+
+
+def legacy_save(path: str, boards: list) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for b in boards:
+            f.write(json.dumps(b, ensure_ascii=False) + "\n")
+
+
+def legacy_load(path: str) -> list:
+    boards = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                boards.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return boards
+
+
+def codec_save(path: str, boards: list) -> None:
+    Main._atomic_write_lines(path, map(Main.JSON_CODEC.dump_line, boards))
+
+
+def codec_load(path: str) -> list:
+    with open(path, "rb") as f:
+        records, _end, _trailing = Main._read_records(f)
+    return records
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the note file JSON codecs")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated board counts")
+    parser.add_argument("--codecs", default="orjson,ujson,json", help="Comma-separated codecs to try")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    codecs = []
+    for name in [c.strip() for c in args.codecs.split(",") if c.strip()]:
+        codec = Main._json_codec(name)
+        if codec.name != name:
+            print(f"{name}: not installed, skipped")
+            continue
+        codecs.append(codec)
+
+    print(f"{'boards':>9} {'codec':<8} {'save s':>8} {'load s':>8} {'save rec/s':>12} {'load rec/s':>12} {'MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "boards_note.jsonl")
+        for n in sizes:
+            boards = synthetic_boards(n)
+            runs = [("legacy", legacy_save, legacy_load)]
+            runs += [(codec, codec_save, codec_load) for codec in codecs]
+            for codec, save, load in runs:
+                if isinstance(codec, Main.JsonCodec):
+                    Main.JSON_CODEC, label = codec, codec.name
+                else:
+                    label = codec
+                save_s, _ = timed(save, path, boards)
+                load_s, loaded = timed(load, path)
+                assert len(loaded) == n and loaded[-1] == boards[-1], f"{label}: round trip mismatch"
+                del loaded
+                mb = os.path.getsize(path) / (1024 * 1024)
+                print(f"{n:>9} {label:<8} {save_s:>8.3f} {load_s:>8.3f} {n / save_s:>12,.0f} {n / load_s:>12,.0f} {mb:>8.1f}")
+            del boards
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,40 @@ import os
 from typing import Callable
 import datetime
 import calendar
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from virtual_table import VirtualTable
+from thumbnails import ThumbnailCache
+
+# Board details photo previews: thumbnail box, placeholder width (chars)
+# and how often the Tk loop checks for a finished decode
+PHOTO_SIZE = (260, 180)
+PHOTO_PLACEHOLDER_WIDTH = 24
+PHOTO_POLL_MS = 30
 
 # run_gui accepts callables so we avoid importing Main and circular deps.
 # Required functions passed in:
-# - list_boards, add_board, delete_board, find_board_by_id
+# - list_boards, add_board, delete_board, update_board, update_boards_bulk, find_board_by_id
+# - query_boards, distinct_board_values (filtering/sorting pushed down to storage)
+# - import_photos (bulk attach photos from a folder)
+# - batch_quotations (one quotation workbook per site/month)
+# - board_changes, board_fits_query (changes saved by other workstations, for live refresh)
 # - find_employee, add_or_update_employee, delete_employee
 
 def run_gui(
     list_boards: Callable[[], list],
     add_board: Callable[[str, str, str, str, str, str | None, str | None, str | None, str | None, bool, dict | None, str | None], dict],
     delete_board: Callable[[str], bool],
+    update_board: Callable[..., dict | None],
+    update_boards_bulk: Callable[[list, dict], int],
+    query_boards: Callable[..., list],
+    distinct_board_values: Callable[[str], list],
+    import_photos: Callable[..., dict],
+    batch_quotations: Callable[..., dict],
+    board_changes: Callable[..., tuple],
+    board_fits_query: Callable[..., bool],
     find_board_by_id: Callable[[str], dict | None],
     find_employee: Callable[[str], dict | None],
     list_employees: Callable[[], list],
@@ -73,6 +97,11 @@ def run_gui(
             pass
         return os.path.join(os.path.dirname(__file__), "data")
 
+    # Board photo thumbnails, shared by every details window, and the pool
+    # that decodes them off the Tk thread
+    thumbs = ThumbnailCache(os.path.join(_get_data_dir(), "pictures", ".thumbs"))
+    photo_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="photos")
+
     def show_boards_tab(notebook: ttk.Notebook):
         frm_root = ttk.Frame(notebook)
         notebook.add(frm_root, text="Boards")
@@ -294,8 +323,7 @@ def run_gui(
 
         # Hidden filter state and a button to open a pop-up dialog
         def unique_values(key):
-            vals = sorted({(b.get(key) or "") for b in list_boards() if b.get(key)})
-            return ["All"] + vals
+            return ["All"] + distinct_board_values(key)
         site_var = tk.StringVar(value="All")
         size_var = tk.StringVar(value="All")
         user_var = tk.StringVar(value="All")
@@ -356,10 +384,22 @@ def run_gui(
         # Add selectable checkbox column
         selected_ids = set()
         columns = ("Select", "Running No Left", "Running No Right", "Site Name", "IC", "DC", "Size")
-        tree = ttk.Treeview(frm_table, columns=columns, show="headings")
+        def board_row(b):
+            bid = str(b.get("board_id"))
+            p1 = str(b.get("running_no_p1") or "")
+            p2 = str(b.get("running_no_p2") or "")
+            return (
+                "☑" if bid in selected_ids else "☐",
+                p1 or "-",
+                p2 or "-",
+                b.get("name"), b.get("ic"), b.get("dc"), b.get("size")
+            )
+        # Only the visible window of rows is inserted into the Treeview
+        table = VirtualTable(frm_table, columns, row_values=board_row, row_id=lambda b: str(b.get("board_id")))
+        tree = table.tree
         def toggle_select_all():
-            iids = tree.get_children()
-            all_ids = {str(i) for i in iids}
+            # Applies to every board matching the current filters, not just the rendered rows
+            all_ids = set(table.all_ids())
             if len(selected_ids) == len(all_ids) and len(all_ids) > 0:
                 selected_ids.clear()
             else:
@@ -379,7 +419,7 @@ def run_gui(
             elif col in {"Running No Left", "Running No Right"}:
                 default_w = 100
             tree.column(col, width=default_w)
-        tree.pack(fill="both", expand=True)
+        table.pack(fill="both", expand=True)
 
         # Issue fields and state
         issue_fields = [
@@ -448,43 +488,12 @@ def run_gui(
                         issues[k] = 0
                 issues['no_issue'] = bool(no_issue_var.get())
                 issues['total_loss'] = bool(total_loss_var.get())
-                updated = 0
-                for bid in list(selected_ids):
-                    b = find_board_by_id(str(bid))
-                    if not b:
-                        continue
-                    # Preserve photos by passing absolute paths so add_board keeps them relative
-                    base = _get_data_dir()
-                    def abs_or_none(rel):
-                        return os.path.join(base, rel) if rel else None
-                    before_abs = abs_or_none(b.get('before_photo'))
-                    after_abs = abs_or_none(b.get('after_photo'))
-                    try:
-                        delete_board(str(bid))
-                        add_board(
-                            str(bid),
-                            b.get('name') or '',
-                            b.get('ic') or '',
-                            b.get('dc') or '',
-                            b.get('size') or '',
-                            module_number=(b.get('module_number') or None),
-                            pixel=(b.get('pixel') or b.get('size') or None),
-                            board_code=(b.get('board_code') or None),
-                            running_no=(b.get('running_no') or None),
-                            running_no_p1=(b.get('running_no_p1') or None),
-                            running_no_p2=(b.get('running_no_p2') or None),
-                            date_request=(b.get('date_request') or None),
-                            do_date=(b.get('do_date') or None),
-                            date_repair=(b.get('date_repair') or None),
-                            before_photo=before_abs,
-                            after_photo=after_abs,
-                            urgency=bool(b.get('urgency', False)),
-                            issues=issues,
-                            created_by=b.get('created_by') or None,
-                        )
-                        updated += 1
-                    except Exception:
-                        pass
+                # One write for all ticked boards
+                try:
+                    updated = update_boards_bulk([str(bid) for bid in selected_ids], {'issues': issues})
+                except Exception as e:
+                    messagebox.showerror('Issues', str(e))
+                    return
                 refresh_tree()
                 messagebox.showinfo('Issues', f'Applied issues to {updated} board(s).')
                 win.destroy()
@@ -496,82 +505,34 @@ def run_gui(
             ttk.Button(btns, text="Close", command=win.destroy).pack(side='left', padx=6)
             apply_no_issue_state()
 
-        def get_filtered_boards():
-            data = list_boards()
-            # Site
-            s = site_var.get()
-            if s and s != "All":
-                data = [b for b in data if str(b.get("name")) == s]
-            # Size
-            sz = size_var.get()
-            if sz and sz != "All":
-                data = [b for b in data if str(b.get("size")) == sz]
-            # Done by
-            du = user_var.get()
-            if du and du != "All":
-                data = [b for b in data if str(b.get("created_by")) == du]
-            # Urgency
+        sort_specs = {
+            "Date Request (Newest)": "-date_request",
+            "Date Request (Oldest)": "date_request",
+            "Module Number (Asc)": "module_number",
+            "Module Number (Desc)": "-module_number",
+            "Running No (Asc)": "running_no",
+            "Running No (Desc)": "-running_no",
+        }
+
+        def current_query():
+            def choice(var):
+                v = var.get()
+                return None if not v or v == "All" else v
             ug = urg_var.get()
-            if ug == "Yes":
-                data = [b for b in data if bool(b.get("urgency", False))]
-            elif ug == "No":
-                data = [b for b in data if not bool(b.get("urgency", False))]
-            # Months by Date Request
-            sel_months = [m for m in month_names if month_vars[m].get()]
-            if sel_months:
-                mindex = {"Jan":1,"Feb":2,"Mar":3,"Apr":4,"May":5,"Jun":6,"Jul":7,"Aug":8,"Sep":9,"Oct":10,"Nov":11,"Dec":12}
-                def dm(b):
-                    d = b.get("date_request")
-                    if not d:
-                        return None
-                    try:
-                        parts = str(d).split("-")
-                        return int(parts[1])
-                    except Exception:
-                        return None
-                sel_nums = {mindex[m] for m in sel_months}
-                data = [b for b in data if dm(b) in sel_nums]
-            # Sort
-            sv = sort_var.get()
-            def keydate(b):
-                import datetime
-                try:
-                    return datetime.datetime.strptime(str(b.get("date_request")), "%Y-%m-%d")
-                except Exception:
-                    return datetime.datetime(1900,1,1)
-            def keyint(b, k):
-                try:
-                    return int(str(b.get(k) or "0"))
-                except Exception:
-                    return 0
-            if sv == "Date Request (Newest)":
-                data.sort(key=keydate, reverse=True)
-            elif sv == "Date Request (Oldest)":
-                data.sort(key=keydate)
-            elif sv == "Module Number (Asc)":
-                data.sort(key=lambda b: keyint(b, "module_number"))
-            elif sv == "Module Number (Desc)":
-                data.sort(key=lambda b: keyint(b, "module_number"), reverse=True)
-            elif sv == "Running No (Asc)":
-                data.sort(key=lambda b: keyint(b, "running_no"))
-            elif sv == "Running No (Desc)":
-                data.sort(key=lambda b: keyint(b, "running_no"), reverse=True)
-            return data
+            return dict(
+                site=choice(site_var),
+                size=choice(size_var),
+                created_by=choice(user_var),
+                urgency=True if ug == "Yes" else False if ug == "No" else None,
+                months=[idx for idx, m in enumerate(month_names, start=1) if month_vars[m].get()],
+                sort=sort_specs.get(sort_var.get()),
+            )
+
+        def get_filtered_boards():
+            return query_boards(**current_query())
 
         def refresh_tree():
-            for i in tree.get_children():
-                tree.delete(i)
-            for b in get_filtered_boards():
-                bid = str(b.get("board_id"))
-                chk = "☑" if bid in selected_ids else "☐"
-                p1 = str(b.get("running_no_p1") or "")
-                p2 = str(b.get("running_no_p2") or "")
-                tree.insert("", "end", iid=bid, values=(
-                    chk,
-                    p1 or "-",
-                    p2 or "-",
-                    b.get("name"), b.get("ic"), b.get("dc"), b.get("size")
-                ))
+            table.set_rows(get_filtered_boards())
 
 
         # Clear form helper
@@ -784,20 +745,19 @@ def run_gui(
                 abs_p = os.path.join(base, p)
                 return abs_p if os.path.exists(abs_p) else None
 
-            def load_image(path: str | None, max_w=260, max_h=180):
-                if not path:
-                    return None
-                try:
-                    from PIL import Image, ImageTk  # Pillow
-                    img = Image.open(path)
-                    img.thumbnail((max_w, max_h), Image.LANCZOS)
-                    return ImageTk.PhotoImage(img)
-                except Exception:
+            def to_photo(img, path: str):
+                # Tk images must be created on the Tk thread
+                if img is not None:
                     try:
-                        # Fallback for PNG/GIF if Pillow missing
-                        return tk.PhotoImage(file=path)
+                        from PIL import ImageTk  # Pillow
+                        return ImageTk.PhotoImage(img)
                     except Exception:
-                        return None
+                        pass
+                try:
+                    # Fallback for PNG/GIF if Pillow missing
+                    return tk.PhotoImage(file=path)
+                except Exception:
+                    return None
 
             before_abs = resolve_path(b.get("before_photo"))
             after_abs = resolve_path(b.get("after_photo"))
@@ -805,24 +765,58 @@ def run_gui(
             left = ttk.Frame(photos)
             left.pack(side="left", padx=8)
             ttk.Label(left, text="Before").pack(anchor="w")
-            before_lbl = ttk.Label(left)
+            before_lbl = ttk.Label(left, width=PHOTO_PLACEHOLDER_WIDTH, anchor="center")
             before_lbl.pack()
             right = ttk.Frame(photos)
             right.pack(side="left", padx=8)
             ttk.Label(right, text="After").pack(anchor="w")
-            after_lbl = ttk.Label(right)
+            after_lbl = ttk.Label(right, width=PHOTO_PLACEHOLDER_WIDTH, anchor="center")
             after_lbl.pack()
 
-            win._before_img = load_image(before_abs)
-            win._after_img = load_image(after_abs)
-            if win._before_img:
-                before_lbl.configure(image=win._before_img)
-            else:
-                before_lbl.configure(text="No photo")
-            if win._after_img:
-                after_lbl.configure(image=win._after_img)
-            else:
-                after_lbl.configure(text="No photo")
+            # Photos are decoded/resized on the pool; the window shows right away
+            # with placeholders and each image is swapped in by after() polling.
+            # Closing the window drops decodes that have not started yet.
+            pending = []
+            closed = {"value": False}
+
+            def on_destroy(event):
+                if event.widget is win:
+                    closed["value"] = True
+                    for fut in pending:
+                        fut.cancel()
+
+            win.bind("<Destroy>", on_destroy, add="+")
+
+            def show_photo(lbl, attr: str, path: str | None):
+                if not path:
+                    lbl.configure(text="No photo")
+                    return
+                lbl.configure(text="Loading…")
+                fut = photo_pool.submit(thumbs.get, path, PHOTO_SIZE)
+                pending.append(fut)
+
+                def poll():
+                    if closed["value"]:
+                        return
+                    if not fut.done():
+                        win.after(PHOTO_POLL_MS, poll)
+                        return
+                    try:
+                        img = fut.result()
+                    except Exception:
+                        img = None
+                    photo = to_photo(img, path)
+                    # Keep a reference or Tk drops the image
+                    setattr(win, attr, photo)
+                    if photo:
+                        lbl.configure(image=photo, text="", width=0)
+                    else:
+                        lbl.configure(text="No photo")
+
+                win.after(PHOTO_POLL_MS, poll)
+
+            show_photo(before_lbl, "_before_img", before_abs)
+            show_photo(after_lbl, "_after_img", after_abs)
 
             def open_file(path):
                 if path and os.path.exists(path):
@@ -1137,36 +1131,33 @@ def run_gui(
             def on_ok():
                 data = {k: entries_local[k].get().strip() for k in entries_local}
                 try:
-                    existing2 = find_board_by_id(board_id)
-                    if not existing2:
-                        messagebox.showwarning("Not found", "Selected board no longer exists.")
-                        return
-                    before_photo = data["before_photo"] or existing2.get("before_photo") or None
-                    after_photo = data["after_photo"] or existing2.get("after_photo") or None
-                    delete_board(board_id)
                     issues = {k: int(issue_vars_local[k].get()) for k in issue_fields}
                     if no_issue_local.get():
                         for k in issue_fields: issues[k] = 0
                     issues['no_issue'] = bool(no_issue_local.get())
                     issues['total_loss'] = bool(total_loss_local.get())
-                    add_board(
-                        board_id,
-                        data["name"], data["ic"], data["dc"], data["size"],
+                    fields = dict(
+                        name=data["name"], ic=data["ic"], dc=data["dc"], size=data["size"],
                         module_number=(data["module_number"] or None),
                         pixel=(data["size"] or None),
                         board_code=(data["board_code"] or None),
                         running_no=(data["running_no"] or None),
-                        running_no_p1=(existing2.get("running_no_p1") or None),
-                        running_no_p2=(existing2.get("running_no_p2") or None),
                         date_request=(data["date_request"] or None),
                         do_date=(data["do_date"] or None),
                         date_repair=(data["date_repair"] or None),
-                        before_photo=before_photo,
-                        after_photo=after_photo,
                         urgency=bool(urg_local.get()),
                         issues=issues,
                         created_by=current_user,
                     )
+                    # Blank photo entries keep the stored photo
+                    if data["before_photo"]:
+                        fields["before_photo"] = data["before_photo"]
+                    if data["after_photo"]:
+                        fields["after_photo"] = data["after_photo"]
+                    # Refused if someone else saved this board since the dialog opened
+                    if update_board(board_id, expected_version=existing.get("_version", 0), **fields) is None:
+                        messagebox.showwarning("Not found", "Selected board no longer exists.")
+                        return
                     refresh_tree(); messagebox.showinfo("Updated", f"Board {board_id} updated."); win.destroy()
                 except Exception as e:
                     messagebox.showerror("Error", str(e))
@@ -1188,6 +1179,104 @@ def run_gui(
         btn_issues = ttk.Button(frm_btn, text="Issues...", command=open_issues_dialog)
         btn_issues.pack(side="left", padx=4)
 
+        def open_import_photos_dialog():
+            win = tk.Toplevel(frm_root)
+            win.title("Import Photos")
+            frm = ttk.Frame(win)
+            frm.pack(fill="both", expand=True, padx=10, pady=10)
+            frm.columnconfigure(1, weight=1)
+            dir_var = tk.StringVar()
+            pattern_var = tk.StringVar(value="{board_id}_{tag}.*")
+            ttk.Label(frm, text="Folder").grid(row=0, column=0, sticky="w", padx=6, pady=4)
+            ttk.Entry(frm, textvariable=dir_var, width=40).grid(row=0, column=1, sticky="ew", padx=6, pady=4)
+            ttk.Button(frm, text="Browse", command=lambda: dir_var.set(filedialog.askdirectory(parent=win) or dir_var.get())).grid(row=0, column=2, padx=4)
+            ttk.Label(frm, text="File pattern").grid(row=1, column=0, sticky="w", padx=6, pady=4)
+            ttk.Entry(frm, textvariable=pattern_var, width=40).grid(row=1, column=1, sticky="ew", padx=6, pady=4)
+            ttk.Label(frm, text="tag: before / after").grid(row=1, column=2, sticky="w", padx=4)
+            bar = ttk.Progressbar(frm, mode="determinate", length=320)
+            bar.grid(row=2, column=0, columnspan=3, sticky="ew", padx=6, pady=(10, 4))
+            status = ttk.Label(frm, text="")
+            status.grid(row=3, column=0, columnspan=3, sticky="w", padx=6)
+            out = tk.Text(frm, height=8, width=64, state="disabled")
+            out.grid(row=4, column=0, columnspan=3, sticky="nsew", padx=6, pady=6)
+            frm.rowconfigure(4, weight=1)
+
+            # The import runs on a thread (which drives the process pool);
+            # progress and the result come back through a queue
+            events = queue.Queue()
+
+            def start():
+                folder = dir_var.get().strip()
+                if not folder or not os.path.isdir(folder):
+                    messagebox.showwarning("Import Photos", "Please choose a folder.", parent=win)
+                    return
+                pattern = pattern_var.get().strip() or "{board_id}_{tag}.*"
+                btn_start.configure(state="disabled")
+                status.configure(text="Scanning folder...")
+
+                def work():
+                    try:
+                        res = import_photos(folder, pattern, progress=lambda done, total: events.put(("progress", done, total)))
+                        events.put(("done", res))
+                    except Exception as e:
+                        events.put(("error", str(e)))
+
+                threading.Thread(target=work, daemon=True).start()
+                frm_root.after(100, poll)
+
+            def show_result(text: str):
+                out.configure(state="normal")
+                out.delete("1.0", tk.END)
+                out.insert("1.0", text)
+                out.configure(state="disabled")
+
+            def poll():
+                final = None
+                progress = None
+                try:
+                    while True:
+                        ev = events.get_nowait()
+                        if ev[0] == "progress":
+                            progress = ev
+                        else:
+                            final = ev
+                except queue.Empty:
+                    pass
+                alive = bool(win.winfo_exists())
+                if alive and progress is not None:
+                    _, done, total = progress
+                    bar.configure(maximum=max(total, 1), value=done)
+                    status.configure(text=f"Storing photos: {done}/{total}")
+                if final is None:
+                    frm_root.after(100, poll)
+                    return
+                if final[0] == "error":
+                    if alive:
+                        status.configure(text="Import failed")
+                        btn_start.configure(state="normal")
+                    messagebox.showerror("Import Photos", final[1])
+                    return
+                res = final[1]
+                refresh_tree()
+                if not alive:
+                    return
+                summary = (
+                    f"Stored {res['stored']} photo(s) on {res['boards']} board(s); "
+                    f"{res['unmatched']} file(s) did not match the pattern."
+                )
+                status.configure(text=summary)
+                lines = [f"{name}: {err}" for name, err in res["errors"]]
+                show_result("\n".join(lines) if lines else "No errors.")
+                btn_start.configure(state="normal")
+
+            btns = ttk.Frame(frm)
+            btns.grid(row=5, column=0, columnspan=3, sticky="e")
+            btn_start = ttk.Button(btns, text="Import", command=start)
+            btn_start.pack(side="left", padx=6)
+            ttk.Button(btns, text="Close", command=win.destroy).pack(side="left", padx=6)
+
+        ttk.Button(frm_btn, text="Import Photos...", command=open_import_photos_dialog).pack(side="left", padx=4)
+
         # Single handler: toggle only when clicking the first (Select) column
         def on_tree_click(event):
             col = tree.identify_column(event.x)
@@ -1200,9 +1289,7 @@ def run_gui(
                     selected_ids.remove(bid)
                 else:
                     selected_ids.add(bid)
-                new_chk = "☑" if bid in selected_ids else "☐"
-                vals = tree.item(row, "values")
-                tree.item(row, values=(new_chk,)+tuple(vals[1:]))
+                table.refresh_row(row)
                 return
             # Ignore clicks on other columns to avoid accidental deselect
         tree.bind("<Button-1>", on_tree_click, add="+")
@@ -1211,13 +1298,22 @@ def run_gui(
         def open_viewer_window():
             try:
                 from viewer_gui import run_viewer as _run_viewer
-                _run_viewer(list_boards=list_boards)
+                _run_viewer(
+                    list_boards=list_boards, query_boards=query_boards,
+                    distinct_board_values=distinct_board_values, board_changes=board_changes,
+                    board_fits_query=board_fits_query,
+                    find_board_by_id=find_board_by_id,
+                )
             except Exception as e:
                 messagebox.showerror("Viewer", f"Unable to open viewer: {e}")
         ttk.Button(frm_btn, text="Open Viewer...", command=open_viewer_window).pack(side="right", padx=4)
 
         # No auto-fill into a static form; selection only toggles checkboxes
         refresh_tree()
+        table.follow(
+            board_changes, refresh_tree, lookup=find_board_by_id,
+            fits=lambda old, new: board_fits_query(old, new, **current_query()),
+        )
 
     # Employees tab moved to employees_gui to keep separation of concerns
     from employees_gui import add_employees_tab
@@ -1284,7 +1380,12 @@ def run_gui(
     def open_viewer_page():
         try:
             from viewer_gui import run_viewer as _run_viewer
-            _run_viewer(list_boards=list_boards)
+            _run_viewer(
+                list_boards=list_boards, query_boards=query_boards,
+                distinct_board_values=distinct_board_values, board_changes=board_changes,
+                board_fits_query=board_fits_query,
+                find_board_by_id=find_board_by_id,
+            )
         except Exception as e:
             messagebox.showerror("Viewer", f"Unable to open viewer: {e}")
 
@@ -1302,7 +1403,12 @@ def run_gui(
         body.pack(fill="both", expand=True)
         try:
             from quotations_gui import run_quotations as _run_quotations
-            _run_quotations(body, list_boards=list_boards)
+            _run_quotations(
+                body, list_boards=list_boards, query_boards=query_boards,
+                distinct_board_values=distinct_board_values, batch_quotations=batch_quotations,
+                board_changes=board_changes, board_fits_query=board_fits_query,
+                find_board_by_id=find_board_by_id,
+            )
         except Exception as e:
             messagebox.showerror("Quotations", f"Unable to open quotations: {e}")
 
@@ -1418,3 +1524,4 @@ def run_gui(
 
     show_login()
     root.mainloop()
+    photo_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,478 @@
+import csv
+import datetime as _dt
+import os
+import re
+from copy import copy
+from functools import lru_cache
+from io import BytesIO
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# Issue columns of the quotation table, in order
+ISSUE_FIELDS = (
+    "caterpillar",
+    "pixel drop",
+    "pixel problem",
+    "kaki patah",
+    "green/red/blue line",
+    "box problem",
+    "module blackout",
+    "broken module",
+    "broken connector",
+    "broken power socket",
+    "wiring",
+    "broken frame",
+)
+# Mapping of issue header to possible board keys (normalized)
+ISSUE_KEY_MAP = {
+    "caterpillar": ["caterpillar"],
+    "pixel drop": ["lamp_pixel_drop", "pixel_drop"],
+    "pixel problem": ["lamp_pixel_problem", "pixel_problem"],
+    "kaki patah": ["kakipatah", "kaki_patah"],
+    "green/red/blue line": [
+        "green/red/blue line",
+        "greenredblueline",
+        "anomalyline",
+        "line_issue",
+        "rgb_line",
+        "grb_line",
+        "rgbline",
+        "grbline",
+    ],
+    "box problem": ["boxproblem"],
+    "module blackout": ["moduleblackout", "halfwholemoduleblackout"],
+    "broken module": ["brokenmodule"],
+    "broken connector": ["brokenconnector"],
+    "broken power socket": ["brokenpowersocket"],
+    "wiring": ["wiring"],
+    "broken frame": ["brokenframe"],
+}
+
+# Boards per printed table
+PAGE_SIZE = 10
+# Remark/signature block spans up to column Q
+LAST_COL = 17
+COMPANY_NAME = "IDS BEYOND MEDIA SDN BHD"
+COMPANY_CONTACT = "Website: www.megascreen.com.my   Tel: 601-657 3233   Fax: 604-656 1318"
+LOGO_CANDIDATES = ("IDS LOGO.png", "logo.png", "logo.jpg")
+# Drawn height of the logo in pixels; its width spans the table
+LOGO_HEIGHT = 80
+
+# Quotation rows as shown in the Quotations page: (board_id, module_no, rn_no, issue, quantity)
+QuoteRow = Sequence[Any]
+
+
+def quote_row(board: Dict) -> QuoteRow:
+    """Quotation row for a board as added from the Quotations page: no issue picked, quantity 1."""
+    rn_right = str(board.get("running_no_p2") or "") or str(board.get("running_no") or "")
+    return (str(board.get("board_id")), board.get("module_number") or "-", rn_right or "-", "", 1)
+
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+def _norm(s: str) -> str:
+    return _NON_ALNUM.sub("", (s or "").lower())
+
+
+# Normalized issue name/alias -> issue column header, built once per process
+_ISSUE_SYNONYMS: Dict[str, str] = {}
+for _hdr in ISSUE_FIELDS:
+    _ISSUE_SYNONYMS[_norm(_hdr)] = _hdr
+    for _alt in ISSUE_KEY_MAP.get(_hdr, []):
+        _ISSUE_SYNONYMS[_norm(_alt)] = _hdr
+# Normalized board keys tried for each issue column, the header itself last
+_ISSUE_ALIASES: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(_norm(a) for a in list(ISSUE_KEY_MAP.get(h, [])) + [h]) for h in ISSUE_FIELDS
+)
+
+
+def _logo_path() -> Optional[str]:
+    base = os.path.join(os.path.dirname(__file__), "assets")
+    return next((p for p in (os.path.join(base, n) for n in LOGO_CANDIDATES) if os.path.exists(p)), None)
+
+
+@lru_cache(maxsize=4)
+def _logo_data(size: Tuple[int, int]) -> Optional[bytes]:
+    """
+    The logo as PNG bytes at the size it is drawn, decoded and encoded once per process.
+
+    Every page carries its own copy of the picture in the workbook, so the
+    copies are also only as large as they are shown.
+    """
+    path = _logo_path()
+    if path is None:
+        return None
+    try:
+        from PIL import Image  # Pillow, needed by openpyxl for pictures anyway
+        with Image.open(path) as src:
+            img = src.resize(size, Image.LANCZOS)
+        buf = BytesIO()
+        img.save(buf, "PNG", optimize=True)
+        return buf.getvalue()
+    except Exception:
+        return None
+
+
+class _Styles:
+    """
+    One prototype cell per style combination.
+
+    Assigning Font/Border/Alignment objects makes openpyxl hash and look up
+    every object per cell; copying a prototype's style array is a plain
+    array copy, so every cell of the same kind shares the same style ids.
+    """
+
+    def __init__(self, ws):
+        from openpyxl.cell import WriteOnlyCell  # type: ignore
+        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side  # type: ignore
+
+        self._cell = WriteOnlyCell
+        self.ws = ws
+        thin = Side(style="thin", color="000000")
+        medium = Side(style="medium", color="000000")
+        border_all = Border(left=thin, right=thin, top=thin, bottom=thin)
+        center = Alignment(horizontal="center", vertical="center")
+        specs = {
+            "plain": {},
+            "company": {"font": Font(b=True, size=14)},
+            "bold": {"font": Font(b=True)},
+            "title": {"font": Font(b=True, size=12), "alignment": Alignment(horizontal="center")},
+            "boxed": {"border": border_all},
+            "header": {
+                "font": Font(b=True, size=8),
+                "alignment": Alignment(horizontal="center", vertical="center", wrap_text=True),
+                "fill": PatternFill("solid", fgColor="DDDDDD"),
+                "border": border_all,
+            },
+            "base": {"border": border_all, "alignment": center},
+            "small": {"border": border_all, "alignment": center, "font": Font(size=6.5)},
+            "total_label": {"border": border_all, "font": Font(b=True), "alignment": Alignment(horizontal="right")},
+            "total_value": {"border": border_all, "font": Font(b=True)},
+            "remark": {"font": Font(b=True, size=10), "alignment": Alignment(horizontal="left")},
+            "left": {"alignment": Alignment(horizontal="left")},
+            "right": {"alignment": Alignment(horizontal="right")},
+            "signature": {"border": Border(top=medium)},
+        }
+        self._protos = {}
+        for name, attrs in specs.items():
+            proto = WriteOnlyCell(ws)
+            for attr, value in attrs.items():
+                setattr(proto, attr, value)
+            self._protos[name] = proto
+
+    def cell(self, value: Any, style: str):
+        c = self._cell(self.ws, value=value)
+        proto = self._protos[style]
+        if proto.has_style:
+            c._style = copy(proto._style)
+        return c
+
+
+class _Row(NamedTuple):
+    """A row ready to append: values by column (styled cells prepared), height, merged column letters."""
+    values: List[Any]
+    height: Optional[float]
+    merges: Tuple[Tuple[str, str], ...]
+
+
+class _RowWriter:
+    """Appends rows to a write-only worksheet while tracking the row number."""
+
+    def __init__(self, ws, styles: _Styles):
+        self.ws = ws
+        self.styles = styles
+        self.row = 0
+        self.merges: List[str] = []
+
+    def prepare(self, cells: Optional[Dict[int, Any]] = None, height: Optional[float] = None, merges=()) -> _Row:
+        """Build a row once; cells maps column -> (value, style), merges are (first, last) columns."""
+        from openpyxl.utils import get_column_letter  # type: ignore
+
+        values: List[Any] = []
+        for col, (value, style) in sorted((cells or {}).items()):
+            values.extend([None] * (col - 1 - len(values)))
+            # Unstyled values go in bare: openpyxl recycles a plain cell object for the next value
+            values.append(value if style == "plain" else self.styles.cell(value, style))
+        return _Row(values, height, tuple((get_column_letter(c1), get_column_letter(c2)) for c1, c2 in merges))
+
+    def write(self, row: _Row) -> int:
+        """Append a prepared row (as often as needed: cells are written out as they are appended)."""
+        self.row += 1
+        r = self.row
+        if row.height is not None:
+            # Row dimensions are read when the row is written, so set them first
+            self.ws.row_dimensions[r].height = row.height
+        self.ws.append(row.values)
+        self.merges.extend(f"{c1}{r}:{c2}{r}" for c1, c2 in row.merges)
+        return r
+
+    def add(self, cells: Optional[Dict[int, Any]] = None, height: Optional[float] = None, merges=()) -> int:
+        return self.write(self.prepare(cells, height, merges))
+
+    def close(self) -> None:
+        """Register the merged ranges; they are only written when the workbook is saved."""
+        from openpyxl.worksheet.cell_range import MultiCellRange  # type: ignore
+
+        # Each range sits on its own row, so skip merged_cells.add(), which
+        # checks every new range against all earlier ones
+        self.ws.merged_cells = MultiCellRange(" ".join(self.merges))
+
+
+def _boxed(cells: Dict[int, Any], c1: int, c2: int, value: Any) -> None:
+    # Merged box: value in the first cell, border on every cell of the range
+    for c in range(c1, c2 + 1):
+        cells[c] = (value if c == c1 else None, "boxed")
+
+
+@lru_cache(maxsize=256)
+def _match_issue_name(text: Optional[str]) -> Optional[str]:
+    """Issue column header for a free-text issue name, or None."""
+    if not text:
+        return None
+    n = _norm(text)
+    if n in _ISSUE_SYNONYMS:
+        return _ISSUE_SYNONYMS[n]
+    # token/substring fallback
+    for key, hdr in _ISSUE_SYNONYMS.items():
+        if key in n or n in key:
+            return hdr
+    return None
+
+
+def _issue_counts(board: Dict) -> Tuple[Optional[int], ...]:
+    """The board's own nonzero count for each issue column, else None (supports nested 'issues' dict)."""
+    flat: Dict[str, Any] = {}
+
+    def _flatten(prefix, obj):
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                key = _norm((prefix + '_' + str(k)) if prefix else str(k))
+                flat[key] = v
+                _flatten(key, v)
+
+    _flatten('', board)
+    counts = []
+    for aliases in _ISSUE_ALIASES:
+        val = None
+        for nk in aliases:
+            if flat.get(nk) not in (None, ""):
+                val = flat[nk]
+                break
+        # If still None, try any key containing the header token
+        if val is None:
+            for bk, bv in flat.items():
+                if aliases[-1] in bk and bv not in (None, ""):
+                    val = bv
+                    break
+        try:
+            n = int(val)
+        except Exception:
+            n = None
+        counts.append(n if n else None)
+    return tuple(counts)
+
+
+def _issue_values(counts: Tuple[Optional[int], ...], issue_val: str, qty_val: Any) -> List[Any]:
+    # Issue columns: prefer board counts if present; else put the row quantity under the row's Issue
+    canon = _match_issue_name(issue_val)
+    try:
+        qn = int(qty_val)
+    except Exception:
+        qn = qty_val
+    fallback = qn if qn not in (None, "", 0) else None
+    return [c if c is not None else (fallback if canon == name else None) for c, name in zip(counts, ISSUE_FIELDS)]
+
+
+def export_quotation_xlsx(
+    path: str,
+    rows: List[QuoteRow],
+    meta: Dict[str, Any],
+    boards: Mapping[str, Dict],
+) -> None:
+    """
+    Write a quotation workbook: one printed table of PAGE_SIZE boards per page.
+
+    boards maps board_id to board; take it once per export (not per row) so
+    the cost scales with the rows written, not with the size of the store.
+
+    The sheet is streamed with openpyxl's write-only mode. Merged ranges, row
+    heights, column widths and the logo are all supported there, so the
+    header blocks need no separate in-memory sheet; cells share prototype
+    styles (see _Styles). The fixed rows of a page are prepared once per
+    quotation and re-appended on every page; the logo is rendered once per
+    process.
+    """
+    try:
+        from openpyxl import Workbook  # type: ignore
+        from openpyxl.utils import get_column_letter  # type: ignore
+    except Exception as e:
+        raise RuntimeError("openpyxl is required for .xlsx export") from e
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Quotation")
+    # Hide default Excel gridlines to match printed look
+    ws.sheet_view.showGridLines = False
+    # Fit to A4 portrait and narrow margins to squeeze content
+    ws.page_setup.orientation = 'portrait'
+    ws.page_setup.fitToWidth = 1
+    ws.page_setup.fitToHeight = 0
+    ws.page_margins.left = 0.3
+    ws.page_margins.right = 0.3
+    ws.page_margins.top = 0.5
+    ws.page_margins.bottom = 0.5
+
+    headers = ["Item", "Module No", "RN No"] + list(ISSUE_FIELDS) + ["Quantity"]
+    # Column widths must be known before the first row is streamed
+    widths = {"Item": 5, "Module No": 7, "RN No": 8}
+    for idx, h in enumerate(headers, start=1):
+        ws.column_dimensions[get_column_letter(idx)].width = widths.get(h, 8)
+    # Approximate pixel width of the table from Excel character widths
+    logo_width = int(sum(widths.get(h, 8) for h in headers) * 7)
+    qty_col = len(headers)
+    end_merge_col = qty_col - 1
+
+    styles = _Styles(ws)
+    out = _RowWriter(ws, styles)
+    row = out.prepare
+    logo = _logo_data((logo_width, LOGO_HEIGHT))
+    today = _dt.date.today().strftime('%d-%b-%y')
+    pages = [rows[i:i + PAGE_SIZE] for i in range(0, len(rows), PAGE_SIZE)] or [[]]
+    # Issue counts per board, resolved once even if a board is on several rows
+    vectors: Dict[str, Tuple[Optional[int], ...]] = {}
+
+    try:
+        total_qty = int(meta.get('total_repair_modules'))
+    except Exception:
+        total_qty = 0
+        for v in rows:
+            try:
+                total_qty += int(v[4])
+            except Exception:
+                pass
+
+    # Everything but the page number and the table lines is the same on every
+    # page: build those rows (and their styled cells) once per quotation
+    blank = row()
+    company = row({2: (COMPANY_NAME, "company")}, height=30, merges=[(2, 9)])
+    contact = row({2: (COMPANY_CONTACT, "plain")}, height=30, merges=[(2, 9)])
+    quote_no = f"QUOTATION NO: {meta.get('quotation_id','')}"
+    # Bold on the first page only
+    quote_no_first = row({1: (quote_no, "bold")}, merges=[(1, 9)])
+    quote_no_rest = row({1: (quote_no, "plain")}, merges=[(1, 9)])
+    date_line = row({1: (f"Date: {today}", "plain")}, merges=[(1, 9)])
+
+    # Project/Remark boxes
+    box1: Dict[int, Any] = {}
+    _boxed(box1, 1, 5, f"Project Name: {meta.get('project_name','')}")
+    _boxed(box1, 6, 9, f"Modules Code: {meta.get('modules_code','')}")
+    box2: Dict[int, Any] = {}
+    _boxed(box2, 1, 5, f"Project Code: {meta.get('project_code','')}")
+    _boxed(box2, 6, 9, f"Total Repair Modules : {meta.get('total_repair_modules','')}pcs")
+    # Date Request and Pixel row
+    box3: Dict[int, Any] = {}
+    _boxed(box3, 1, 2, "Date Request")
+    _boxed(box3, 3, 5, meta.get('date_request', ''))
+    _boxed(box3, 6, 7, "Pixel")
+    _boxed(box3, 8, 9, meta.get('pixel', ''))
+    head = [
+        blank,
+        row({1: ("QUOTATION", "title")}, merges=[(1, 9)]),
+        blank,
+        row(box1, merges=[(1, 5), (6, 9)]),
+        row(box2, merges=[(1, 5), (6, 9)]),
+        row(box3, merges=[(1, 2), (3, 5), (6, 7), (8, 9)]),
+        blank,
+        # Table headers
+        row({idx: (h, "header") for idx, h in enumerate(headers, start=1)}, height=20),
+    ]
+
+    # Totals row (Total Repair Modules) with full-width border
+    totals: Dict[int, Any] = {1: ("Total Repair Modules (pcs)", "total_label")}
+    for c in range(2, end_merge_col + 1):
+        totals[c] = (None, "boxed")
+    totals[qty_col] = (total_qty, "total_value")
+    # Authorized by (left) and Date (right) on same row
+    start_c = LAST_COL - 6
+    end_c = LAST_COL - 2
+    foot = [
+        row(totals, merges=[(1, end_merge_col)]),
+        blank,
+        blank,
+        # Textual Remark section
+        row({1: ("Remark:", "remark")}, merges=[(1, LAST_COL)]),
+        row(
+            {1: ("** Please Notice that above information is just an estimate cost of repair & rework for Led Modules.", "left")},
+            height=18, merges=[(1, LAST_COL)],
+        ),
+        blank,
+        row({1: ("Authorized  by :", "left"), start_c: ("Date:", "right")}, merges=[(1, start_c - 1), (start_c, end_c)]),
+        blank,
+        # Signature line
+        row({c: (None, "signature") for c in range(1, 7)}, height=12),
+        row({1: ("Repair & Rework Team", "left")}),
+    ]
+
+    # Table lines reuse one styled cell per column; only the values change
+    line = row({c: (None, "base" if c <= 3 else "small") for c in range(1, qty_col + 1)}, height=12)
+    project_code = str(meta.get('project_code', '')).strip()
+
+    for page_index, page_rows in enumerate(pages, start=1):
+        # Logo and company info on every table
+        r = out.write(company)
+        if logo is not None:
+            try:
+                from openpyxl.drawing.image import Image as XLImage  # type: ignore
+                img = XLImage(BytesIO(logo))
+                ws.add_image(img, f"A{r}")
+            except Exception:
+                pass
+        out.write(contact)
+        out.write(blank)
+
+        # Quotation meta
+        out.write(quote_no_first if page_index == 1 else quote_no_rest)
+        out.write(date_line)
+        out.add({1: (f"Page: {page_index} of {len(pages)}", "plain")}, merges=[(1, 9)])
+        for head_row in head:
+            out.write(head_row)
+
+        # Table rows: always render PAGE_SIZE lines with full borders
+        for i in range(PAGE_SIZE):
+            if i < len(page_rows):
+                v = page_rows[i]
+                item_no = (page_index - 1) * PAGE_SIZE + i + 1
+                # Module No column: use Project Code from meta instead of board module number
+                module_cell = project_code or v[1]
+                qty_val = v[4]
+                bid = str(v[0])
+                counts = vectors.get(bid)
+                if counts is None:
+                    counts = vectors[bid] = _issue_counts(boards.get(bid) or {})
+                issues = _issue_values(counts, str(v[3]).strip(), qty_val)
+                qv = int(qty_val) if str(qty_val).isdigit() else qty_val
+                values = [item_no, module_cell, v[2]] + issues + [qv]
+            else:
+                values = [None] * qty_col
+            for cell, value in zip(line.values, values):
+                cell.value = value
+            out.write(line)
+
+        for foot_row in foot:
+            out.write(foot_row)
+    out.close()
+    wb.save(path)
+
+
+def export_quotation_csv(path: str, rows: List[QuoteRow], meta: Dict[str, Any]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Quotation ID", meta.get('quotation_id','')])
+        writer.writerow(["Project Name", meta.get('project_name','')])
+        writer.writerow(["Project Code", meta.get('project_code','')])
+        writer.writerow(["Modules Code", meta.get('modules_code','')])
+        writer.writerow(["Total Repair Modules", meta.get('total_repair_modules','')])
+        writer.writerow(["Date Request", meta.get('date_request','')])
+        writer.writerow([])
+        writer.writerow(["Item", "Module No", "RN No", "Issue", "Quantity"])
+        for i, r in enumerate(rows, start=1):
+            writer.writerow([i, r[1], r[2], r[3], r[4]])
@@ -1,17 +1,38 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import datetime as _dt
-import os
-from typing import Callable, List, Dict, Any
-
-
-def run_quotations(parent: tk.Widget, list_boards: Callable[[], List[Dict[str, Any]]]):
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from quotation_export import ISSUE_FIELDS, export_quotation_csv, export_quotation_xlsx
+from virtual_table import VirtualTable
+
+# Quiet time after the last keystroke before the search runs
+SEARCH_DEBOUNCE_MS = 200
+# How often the Tk loop checks a running search for its result
+SEARCH_POLL_MS = 25
+
+
+def run_quotations(
+    parent: tk.Widget,
+    list_boards: Callable[[], List[Dict[str, Any]]],
+    query_boards: Callable[..., List[Dict[str, Any]]],
+    distinct_board_values: Callable[[str], List[str]],
+    batch_quotations: Callable[..., Dict[str, Any]],
+    board_changes: Optional[Callable[..., Tuple[int, Any]]] = None,
+    find_board_by_id: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None,
+    board_fits_query: Optional[Callable[..., bool]] = None,
+):
     """
     Build a Quotations page inside the given parent widget.
 
     - Left: Boards from database with basic filters and selection
     - Right: Current quotation items
     - Actions: Add to quotation, remove, clear, and Export to Excel (.xlsx) with CSV fallback
+    - Batch Export: one workbook per site/month for the ticked (or all filtered) boards
+    - The boards list follows saves from other workstations when board_changes is given
     """
     # Root container for this page
     page = ttk.Frame(parent)
@@ -54,9 +75,20 @@ def run_quotations(parent: tk.Widget, list_boards: Callable[[], List[Dict[str, A
     # Multi-select via checkbox column
     selected_ids: set[str] = set()
     cols = ("Select", "Board ID", "Site Name", "Running No Right", "Size")
-    tv_boards = ttk.Treeview(left, columns=cols, show="headings", height=12, selectmode="extended")
+    def board_row(b):
+        bid = str(b.get("board_id"))
+        rn_right = str(b.get("running_no_p2") or "") or (str(b.get("running_no") or ""))
+        rn_right = rn_right if rn_right else "-"
+        return ("☑" if bid in selected_ids else "☐", bid, b.get("name") or "", rn_right, b.get("size") or "")
+    # Only the visible window of rows is inserted into the Treeview
+    boards_table = VirtualTable(
+        left, cols, row_values=board_row, row_id=lambda b: f"b:{b.get('board_id')}",
+        height=12, selectmode="extended",
+    )
+    tv_boards = boards_table.tree
     def toggle_select_all():
-        iids = tv_boards.get_children()
+        # Applies to every board matching the current filters, not just the rendered rows
+        iids = boards_table.all_ids()
         all_ids = {iid.split(":", 1)[1] if ":" in iid else iid for iid in iids}
         if len(selected_ids) == len(all_ids) and len(all_ids) > 0:
             selected_ids.clear()
@@ -75,7 +107,7 @@ def run_quotations(parent: tk.Widget, list_boards: Callable[[], List[Dict[str, A
             if c == "Running No Right":
                 w = 120
         tv_boards.column(c, width=w, stretch=False)
-    tv_boards.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+    boards_table.pack(fill="both", expand=True, padx=8, pady=(0, 8))
 
     # Right: quotation items
     right = ttk.LabelFrame(page, text="Quotation Items")
@@ -108,22 +140,13 @@ def run_quotations(parent: tk.Widget, list_boards: Callable[[], List[Dict[str, A
     btn_remove.grid(row=0, column=0, sticky="e", padx=4)
     btn_clear.grid(row=0, column=1, sticky="w", padx=4)
     btn_export.grid(row=0, column=1, sticky="e", padx=4)
+    btn_batch = ttk.Button(actions, text="Batch Export…")
+    btn_batch.grid(row=1, column=1, sticky="e", padx=4, pady=(4, 0))
 
     # Helpers
-    def _matches(b: Dict[str, Any], q: str) -> bool:
-        if not q:
-            return True
-        ql = q.lower()
-        for k in ("board_id", "name", "running_no", "size", "running_no_p1", "running_no_p2"):
-            v = b.get(k)
-            if v and ql in str(v).lower():
-                return True
-        return False
-
     def unique_values(key: str):
         try:
-            vals = sorted({(str(b.get(key)) or "") for b in list_boards() if b.get(key)})
-            return ["All"] + vals
+            return ["All"] + distinct_board_values(key)
         except Exception:
             return ["All"]
 
@@ -174,89 +197,112 @@ def run_quotations(parent: tk.Widget, list_boards: Callable[[], List[Dict[str, A
         cb.grid(row=0, column=1, sticky="w", padx=6, pady=4)
         ttk.Button(frm, text="OK", command=lambda: [refresh_boards(), win.destroy()]).grid(row=1, column=1, sticky="e", padx=6, pady=8)
 
+    sort_specs = {
+        "Running No Right (Asc)": "running_no_p2",
+        "Running No Right (Desc)": "-running_no_p2",
+        "Date Request (Newest)": "-date_request",
+        "Date Request (Oldest)": "date_request",
+        "Module Number (Asc)": "module_number",
+        "Module Number (Desc)": "-module_number",
+        "Site Name (A-Z)": "name",
+    }
+
+    def current_query() -> Dict[str, Any]:
+        # Tk variables are only read here, on the Tk thread
+        s = site_var.get()
+        sz = size_var.get()
+        sel_months = [idx for idx, m in enumerate(month_names, start=1) if month_vars[m].get()]
+        return dict(
+            site=s if s and s != "All" else None,
+            size=sz if sz and sz != "All" else None,
+            months=sel_months,
+            text=search_var.get().strip(),
+            sort=sort_specs.get(sort_var.get()),
+        )
+
+    # Live search state: pending after() id, generation of the newest search
+    # and its future. A result is only shown if no newer search started since.
+    search_state: Dict[str, Any] = {"after": None, "gen": 0, "future": None}
+    search_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quote-search")
+
+    def cancel_search():
+        if search_state["after"] is not None:
+            page.after_cancel(search_state["after"])
+            search_state["after"] = None
+        search_state["gen"] += 1
+        fut = search_state["future"]
+        if fut is not None:
+            # Drops it if still queued; a running one finishes and is ignored
+            fut.cancel()
+            search_state["future"] = None
+
     def refresh_boards():
-        tv_boards.delete(*tv_boards.get_children())
-        query = search_var.get().strip()
+        # Filters, search and sorting run in the storage layer (SQL for the sqlite backend)
+        cancel_search()
         try:
-            data = list_boards()
+            data = query_boards(**current_query())
         except Exception as e:
             messagebox.showerror("Error", f"Unable to list boards: {e}")
             data = []
-        # Apply filters
-        s = site_var.get()
-        if s and s != "All":
-            data = [b for b in data if str(b.get("name")) == s]
-        sz = size_var.get()
-        if sz and sz != "All":
-            data = [b for b in data if str(b.get("size")) == sz]
-        # Months by date_request
-        if month_vars:
-            sel_months = [m for m, var in month_vars.items() if var.get()]
-            if sel_months:
-                mindex = {"Jan":1,"Feb":2,"Mar":3,"Apr":4,"May":5,"Jun":6,"Jul":7,"Aug":8,"Sep":9,"Oct":10,"Nov":11,"Dec":12}
-                nums = {mindex[m] for m in sel_months}
-                def dm(b):
-                    d = b.get("date_request")
-                    if not d:
-                        return None
-                    try:
-                        return int(str(d).split("-")[1])
-                    except Exception:
-                        return None
-                data = [b for b in data if dm(b) in nums]
-        # Apply search
-        data = [b for b in data if _matches(b, query)]
-        # Sort
-        def keydate(b):
-            import datetime as _dt
-            try:
-                return _dt.datetime.strptime(str(b.get("date_request")), "%Y-%m-%d")
-            except Exception:
-                return _dt.datetime(1900, 1, 1)
-        def keyint(b, k):
-            try:
-                return int(str(b.get(k) or "0"))
-            except Exception:
-                return 0
-        if sort_var.get() == "Running No Right (Asc)":
-            data.sort(key=lambda b: keyint(b, "running_no_p2"))
-        elif sort_var.get() == "Running No Right (Desc)":
-            data.sort(key=lambda b: keyint(b, "running_no_p2"), reverse=True)
-        elif sort_var.get() == "Date Request (Newest)":
-            data.sort(key=keydate, reverse=True)
-        elif sort_var.get() == "Date Request (Oldest)":
-            data.sort(key=keydate)
-        elif sort_var.get() == "Module Number (Asc)":
-            data.sort(key=lambda b: keyint(b, "module_number"))
-        elif sort_var.get() == "Module Number (Desc)":
-            data.sort(key=lambda b: keyint(b, "module_number"), reverse=True)
-        elif sort_var.get() == "Site Name (A-Z)":
-            data.sort(key=lambda b: str(b.get("name") or ""))
-        # Populate
-        for b in data:
-            bid = str(b.get("board_id"))
-            chk = "☑" if bid in selected_ids else "☐"
-            rn_right = str(b.get("running_no_p2") or "") or (str(b.get("running_no") or ""))
-            rn_right = rn_right if rn_right else "-"
-            tv_boards.insert("", "end", iid=f"b:{bid}", values=(chk, bid, b.get("name") or "", rn_right, b.get("size") or ""))
-
-    def _get_board_by_id(board_id: str) -> Dict[str, Any] | None:
+        boards_table.set_rows(data)
+
+    def schedule_search(_e=None):
+        # Debounce typing: restart the timer on every keystroke
+        if search_state["after"] is not None:
+            page.after_cancel(search_state["after"])
+        search_state["after"] = page.after(SEARCH_DEBOUNCE_MS, start_search)
+
+    def start_search():
+        cancel_search()
+        gen = search_state["gen"]
+        # The worker only touches the store's cached boards, never Tk
+        fut = search_pool.submit(query_boards, **current_query())
+        search_state["future"] = fut
+        page.after(SEARCH_POLL_MS, lambda: poll_search(fut, gen))
+
+    def poll_search(fut, gen):
+        if gen != search_state["gen"]:
+            return
+        if not fut.done():
+            page.after(SEARCH_POLL_MS, lambda: poll_search(fut, gen))
+            return
+        search_state["future"] = None
+        try:
+            data = fut.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Unable to search boards: {e}")
+            return
+        boards_table.set_rows(data)
+
+    def on_page_destroy(event):
+        if event.widget is page:
+            cancel_search()
+            search_pool.shutdown(wait=False, cancel_futures=True)
+
+    page.bind("<Destroy>", on_page_destroy, add="+")
+
+    def _board_snapshot(board_ids) -> Dict[str, Dict[str, Any]]:
+        # Just the boards an action needs, looked up by id (cache hits on the
+        # JSONL store, one indexed SELECT each on sqlite), never a full read
+        ids = list(dict.fromkeys(str(i) for i in board_ids))
         try:
-            for b in list_boards():
-                if str(b.get("board_id")) == str(board_id):
-                    return b
+            if find_board_by_id is None:
+                wanted = set(ids)
+                return {str(b.get("board_id")): b for b in list_boards() if str(b.get("board_id")) in wanted}
+            found = ((bid, find_board_by_id(bid)) for bid in ids)
+            return {bid: b for bid, b in found if b is not None}
         except Exception:
-            return None
-        return None
+            return {}
 
     def add_selected_to_quote():
         # Prefer checkbox selections; fallback to row selection
         rows_to_add = []
         if selected_ids:
             for bid in list(selected_ids):
-                iid = f"b:{bid}"
-                if tv_boards.exists(iid):
-                    rows_to_add.append(tv_boards.item(iid, "values"))
+                # Ticked rows may be scrolled out of the rendered window
+                b = boards_table.get_row(f"b:{bid}")
+                if b is not None:
+                    rows_to_add.append(board_row(b))
         else:
             sel = tv_boards.selection()
             for iid in sel:
@@ -264,10 +310,11 @@ def run_quotations(parent: tk.Widget, list_boards: Callable[[], List[Dict[str, A
         if not rows_to_add:
             messagebox.showinfo("Add", "Select one or more boards to add.")
             return
+        boards = _board_snapshot(vals[1] for vals in rows_to_add)
         for vals in rows_to_add:
             # vals: (chk, bid, site, rn_right, size)
             bid = str(vals[1])
-            b = _get_board_by_id(bid) or {}
+            b = boards.get(bid) or {}
             module_no = b.get("module_number") or "-"
             rn_right = vals[3]
             issue = ""  # admin can fill later
@@ -322,6 +369,7 @@ def run_quotations(parent: tk.Widget, list_boards: Callable[[], List[Dict[str, A
             win.grab_set(); page.wait_window(win)
             return result
 
+        boards = _board_snapshot(r[0] for r in rows)
         computed_total = 0
         for r in rows:
             try:
@@ -331,7 +379,7 @@ def run_quotations(parent: tk.Widget, list_boards: Callable[[], List[Dict[str, A
         # Derive a sensible default for Pixel from the first selected board
         try:
             first_bid = rows[0][0]
-            b0 = _get_board_by_id(str(first_bid)) or {}
+            b0 = boards.get(str(first_bid)) or {}
             default_pixel = str(b0.get('pixel') or b0.get('size') or '')
         except Exception:
             default_pixel = ''
@@ -358,434 +406,130 @@ def run_quotations(parent: tk.Widget, list_boards: Callable[[], List[Dict[str, A
             return
         if path.lower().endswith(".xlsx"):
             try:
-                export_to_xlsx(path, rows, meta)
+                export_quotation_xlsx(path, rows, meta, boards)
                 messagebox.showinfo("Export", f"Saved to {path}")
                 return
             except Exception as e:
                 messagebox.showwarning("Excel export failed", f"Falling back to CSV. Error: {e}")
                 # Fall through to CSV
         try:
-            export_to_csv(path if path.lower().endswith('.csv') else path + '.csv', rows, meta)
+            export_quotation_csv(path if path.lower().endswith('.csv') else path + '.csv', rows, meta)
             messagebox.showinfo("Export", f"Saved to {path if path.lower().endswith('.csv') else path + '.csv'}")
         except Exception as e:
             messagebox.showerror("Export", f"Failed to export: {e}")
 
-    def export_to_xlsx(path: str, rows, meta: dict):
-        try:
-            from openpyxl import Workbook  # type: ignore
-            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side  # type: ignore
-        except Exception as e:
-            raise RuntimeError("openpyxl is required for .xlsx export") from e
-        wb = Workbook()
-        # Common alignment for table cells
-        align_center = Alignment(horizontal="center", vertical="center")
-        # Split into multiple pages of 10 boards each
-        page_size = 10
-        pages = [rows[i:i+page_size] for i in range(0, len(rows), page_size)] or [[]]
-        from openpyxl.utils import get_column_letter  # type: ignore
-        # Try to load a logo image if available
-        logo_path_candidates = [
-            os.path.join(os.path.dirname(__file__), 'assets', 'IDS LOGO.png'),
-            os.path.join(os.path.dirname(__file__), 'assets', 'logo.png'),
-            os.path.join(os.path.dirname(__file__), 'assets', 'logo.jpg'),
-        ]
-        logo_path = next((p for p in logo_path_candidates if os.path.exists(p)), None)
-        # Create a single sheet with all tables stacked vertically
-        ws = wb.active
-        ws.title = "Quotation"
-        # Hide default Excel gridlines to match printed look
-        ws.sheet_view.showGridLines = False
-        # Fit to A4 portrait and narrow margins to squeeze content
-        try:
-            ws.page_setup.orientation = 'portrait'
-            ws.page_setup.fitToWidth = 1
-            ws.page_setup.fitToHeight = 0
-        except Exception:
-            pass
-        try:
-            ws.page_margins.left = 0.3
-            ws.page_margins.right = 0.3
-            ws.page_margins.top = 0.5
-            ws.page_margins.bottom = 0.5
-        except Exception:
-            pass
-
-        # Helper to apply borders to a merged range (outer box)
-        def apply_range_border(r1, c1, r2, c2, border):
-            for rr in range(r1, r2 + 1):
-                for cc in range(c1, c2 + 1):
-                    ws.cell(row=rr, column=cc).border = border
-
-        thin = Side(style="thin", color="000000")
-        border_all = Border(left=thin, right=thin, top=thin, bottom=thin)
-        
-        for page_index, page_rows in enumerate(pages, start=1):
-            # Start position for this table
-            if page_index == 1:
-                r = 1
-                table_start_row = r
-            else:
-                table_start_row = ws.max_row + 1
-                r = table_start_row
-            
-            # Add logo and company info to every table
-            logo_img = None
-            if logo_path:
-                try:
-                    from openpyxl.drawing.image import Image as XLImage  # type: ignore
-                    img = XLImage(logo_path)
-                    img.height = 80  # reduced height
-                    img.width = 400  # temporary; adjusted after column widths are set
-                    ws.add_image(img, f"A{r}")
-                    logo_img = img
-                except Exception:
-                    logo_img = None
-            # Company name line
-            ws.merge_cells(start_row=r, start_column=2, end_row=r, end_column=9)
-            c = ws.cell(row=r, column=2, value="IDS BEYOND MEDIA SDN BHD")
-            c.font = Font(b=True, size=14)
-            # Set row heights to accommodate logo
-            for logo_r in range(r, r + 2):
-                ws.row_dimensions[logo_r].height = 30
-            r += 1
-            # Optional address line (simple placeholder to mimic layout)
-            ws.merge_cells(start_row=r, start_column=2, end_row=r, end_column=9)
-            ws.cell(row=r, column=2, value="Website: www.megascreen.com.my   Tel: 601-657 3233   Fax: 604-656 1318")
-            r += 2
-
-            # Only add metadata on the very first page
-            if page_index == 1:
-                # Quotation meta (box on the right)
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=9)
-                ws.cell(row=r, column=1, value=f"QUOTATION NO: {meta.get('quotation_id','')}").font = Font(b=True)
-                r += 1
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=9)
-                ws.cell(row=r, column=1, value=f"Date: {_dt.date.today().strftime('%d-%b-%y')}")
-                r += 1
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=9)
-                ws.cell(row=r, column=1, value=f"Page: {page_index} of {len(pages)}")
-                r += 2
-                # Title centered
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=9)
-                ws.cell(row=r, column=1, value="QUOTATION").font = Font(b=True, size=12)
-                ws.cell(row=r, column=1).alignment = Alignment(horizontal="center")
-                r += 2
-
-                # Project/Remark boxes
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=5)
-                ws.cell(row=r, column=1, value=f"Project Name: {meta.get('project_name','')}")
-                apply_range_border(r, 1, r, 5, border_all)
-                ws.merge_cells(start_row=r, start_column=6, end_row=r, end_column=9)
-                ws.cell(row=r, column=6, value=f"Modules Code: {meta.get('modules_code','')}")
-                apply_range_border(r, 6, r, 9, border_all)
-                r += 1
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=5)
-                ws.cell(row=r, column=1, value=f"Project Code: {meta.get('project_code','')}")
-                apply_range_border(r, 1, r, 5, border_all)
-                ws.merge_cells(start_row=r, start_column=6, end_row=r, end_column=9)
-                ws.cell(row=r, column=6, value=f"Total Repair Modules : {meta.get('total_repair_modules','')}pcs")
-                apply_range_border(r, 6, r, 9, border_all)
-                r += 1
-
-                # Date Request and Pixel row
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=2)
-                ws.cell(row=r, column=1, value="Date Request")
-                apply_range_border(r, 1, r, 2, border_all)
-                ws.merge_cells(start_row=r, start_column=3, end_row=r, end_column=5)
-                ws.cell(row=r, column=3, value=meta.get('date_request',''))
-                apply_range_border(r, 3, r, 5, border_all)
-                ws.merge_cells(start_row=r, start_column=6, end_row=r, end_column=7)
-                ws.cell(row=r, column=6, value="Pixel")
-                apply_range_border(r, 6, r, 7, border_all)
-                ws.merge_cells(start_row=r, start_column=8, end_row=r, end_column=9)
-                ws.cell(row=r, column=8, value=meta.get('pixel',''))
-                apply_range_border(r, 8, r, 9, border_all)
-                r += 2
-            else:
-                # For subsequent tables, skip the metadata block and go straight to table headers
-                # Add quotation metadata (QUOTATION NO, Date, Page) to subsequent tables
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=9)
-                ws.cell(row=r, column=1, value=f"QUOTATION NO: {meta.get('quotation_id','')}")
-                r += 1
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=9)
-                ws.cell(row=r, column=1, value=f"Date: {_dt.date.today().strftime('%d-%b-%y')}")
-                r += 1
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=9)
-                ws.cell(row=r, column=1, value=f"Page: {page_index} of {len(pages)}")
-                r += 2
-                
-                # Add "QUOTATION" title for consistency
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=9)
-                ws.cell(row=r, column=1, value="QUOTATION").font = Font(b=True, size=12)
-                ws.cell(row=r, column=1).alignment = Alignment(horizontal="center")
-                r += 2
-                
-                # Project metadata block (same as first table) for subsequent tables
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=5)
-                ws.cell(row=r, column=1, value=f"Project Name: {meta.get('project_name','')}")
-                apply_range_border(r, 1, r, 5, border_all)
-                ws.merge_cells(start_row=r, start_column=6, end_row=r, end_column=9)
-                ws.cell(row=r, column=6, value=f"Modules Code: {meta.get('modules_code','')}")
-                apply_range_border(r, 6, r, 9, border_all)
-                r += 1
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=5)
-                ws.cell(row=r, column=1, value=f"Project Code: {meta.get('project_code','')}")
-                apply_range_border(r, 1, r, 5, border_all)
-                ws.merge_cells(start_row=r, start_column=6, end_row=r, end_column=9)
-                ws.cell(row=r, column=6, value=f"Total Repair Modules : {meta.get('total_repair_modules','')}pcs")
-                apply_range_border(r, 6, r, 9, border_all)
-                r += 1
-
-                # Date Request and Pixel row
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=2)
-                ws.cell(row=r, column=1, value="Date Request")
-                apply_range_border(r, 1, r, 2, border_all)
-                ws.merge_cells(start_row=r, start_column=3, end_row=r, end_column=5)
-                ws.cell(row=r, column=3, value=meta.get('date_request',''))
-                apply_range_border(r, 3, r, 5, border_all)
-                ws.merge_cells(start_row=r, start_column=6, end_row=r, end_column=7)
-                ws.cell(row=r, column=6, value="Pixel")
-                apply_range_border(r, 6, r, 7, border_all)
-                ws.merge_cells(start_row=r, start_column=8, end_row=r, end_column=9)
-                ws.cell(row=r, column=8, value=meta.get('pixel',''))
-                apply_range_border(r, 8, r, 9, border_all)
-                r += 2
-
-            # Table headers styled with full borders
-            issue_cols = list(issue_fields)
-            # Build a synonym -> canonical issue header map (normalized)
-            import re
-            def _norm(s: str) -> str:
-                return re.sub(r"[^a-z0-9]", "", (s or "").lower())
-            ISSUE_SYNONYM_MAP = {}
-            for hdr in issue_cols:
-                ISSUE_SYNONYM_MAP[_norm(hdr)] = hdr
-                for alt in ISSUE_KEY_MAP.get(hdr, []):
-                    ISSUE_SYNONYM_MAP[_norm(alt)] = hdr
-            def match_issue_name(text: str | None) -> str | None:
-                if not text:
-                    return None
-                n = _norm(text)
-                if n in ISSUE_SYNONYM_MAP:
-                    return ISSUE_SYNONYM_MAP[n]
-                # token/substring fallback
-                for key, hdr in ISSUE_SYNONYM_MAP.items():
-                    if key in n or n in key:
-                        return hdr
-                return None
-            headers = ["Item", "Module No", "RN No"] + issue_cols + ["Quantity"]
-            fill_grey = PatternFill("solid", fgColor="DDDDDD")
-            start_col = 1
-            for idx, h in enumerate(headers):
-                col_idx = start_col + idx
-                # Limit to column Q (17)
-                if col_idx > 17:
-                    break
-                ws.cell(row=r, column=col_idx, value=h).font = Font(b=True, size=8)
-                # Wrap long issue headers
-                ws.cell(row=r, column=col_idx).alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-                ws.cell(row=r, column=col_idx).fill = fill_grey
-                ws.cell(row=r, column=col_idx).border = border_all
-                if h in ("Module No"):
-                    ws.column_dimensions[get_column_letter(col_idx)].width = 7
-                elif h in ("RN No"):
-                    ws.column_dimensions[get_column_letter(col_idx)].width = 8
-                elif h == "Item":
-                    ws.column_dimensions[get_column_letter(col_idx)].width = 5
-                elif h == "Quantity":
-                    ws.column_dimensions[get_column_letter(col_idx)].width = 8
-                else:
-                    # Issue columns
-                    ws.column_dimensions[get_column_letter(col_idx)].width = 8
-            # Slightly taller header row for readability
-            ws.row_dimensions[r].height = 20
-            r += 1
-
-            # Stretch logo to approximate table width once column widths are known
-            if logo_img is not None:
-                try:
-                    end_col = 3 + len(issue_cols) + 1
-                    total_chars = 0.0
-                    for c in range(1, end_col + 1):
-                        w = ws.column_dimensions[get_column_letter(c)].width or 8
-                        total_chars += float(w)
-                    # Approximate pixel width from Excel character width
-                    logo_img.width = int(total_chars * 7)
-                except Exception:
-                    pass
-
-            # Table rows: always render 10 lines with full borders
-            max_rows = page_size
-            for i in range(max_rows):
-                if i < len(page_rows):
-                    v = page_rows[i]
-                    item_no = (page_index-1)*page_size + i + 1
-                    issue_val = str(v[3]).strip()
-                    qty_val = v[4]
-                else:
-                    issue_val = ""
-                    qty_val = ""
-                # First three base columns
-                # Module No column: use Project Code from meta instead of board module number
-                module_cell = str(meta.get('project_code', '')).strip() if i < len(page_rows) else ""
-                if not module_cell and i < len(page_rows):
-                    module_cell = (page_rows[i][1] if i < len(page_rows) else "")
-                base_vals = [item_no if i < len(page_rows) else "", module_cell, (page_rows[i][2] if i < len(page_rows) else "")]
-                for off, val in enumerate(base_vals):
-                    c = ws.cell(row=r, column=1+off, value=val)
-                    c.border = border_all
-                    c.alignment = align_center
-                # Issue columns: prefer board counts if present (supports nested 'issues' dict); else use row Issue selection
-                canon = match_issue_name(issue_val)
-                # Build normalized board field map once per row
-                b_norm_map = {}
-                if i < len(page_rows):
-                    bid_row = str(page_rows[i][0])
-                    b_row = _get_board_by_id(bid_row) or {}
-                    def _flatten(prefix, obj):
-                        if isinstance(obj, dict):
-                            for k, v in obj.items():
-                                key = _norm((prefix + '_' + str(k)) if prefix else str(k))
-                                b_norm_map[key] = v
-                                _flatten(key, v)
-                        # ignore lists; no expected structure
-                    _flatten('', b_row)
-                for j, issue_name in enumerate(issue_cols):
-                    col_idx = 4 + j
-                    # Try board-provided count first
-                    val = None
-                    aliases = ISSUE_KEY_MAP.get(issue_name, [])
-                    # Also include the header itself as an alias
-                    aliases = list(aliases) + [issue_name]
-                    for alias in aliases:
-                        nk = _norm(alias)
-                        if nk in b_norm_map and b_norm_map.get(nk) not in (None, ""):
-                            val = b_norm_map[nk]
-                            break
-                    # If still None, try any key containing the alias token
-                    if val is None:
-                        for bk, bv in b_norm_map.items():
-                            if nk in bk and bv not in (None, ""):
-                                val = bv
-                                break
-                    # Coerce numeric if possible
-                    try:
-                        val_num = int(val)
-                    except Exception:
-                        val_num = None
-                    if val_num is not None and val_num != 0:
-                        cell_val = val_num
-                    else:
-                        # Fall back to row Issue selection
-                        try:
-                            qn = int(qty_val)
-                        except Exception:
-                            qn = qty_val
-                        cell_val = (qn if (canon == issue_name and qn not in (None, "", 0)) else "")
-                    c = ws.cell(row=r, column=col_idx, value=cell_val)
-                    c.border = border_all
-                    c.font = Font(size=6.5)
-                    c.alignment = align_center
-                try:
-                    # Final Quantity column
-                    qv = int(qty_val) if str(qty_val).isdigit() else qty_val
-                    c = ws.cell(row=r, column=3 + len(issue_cols) + 1, value=qv)
-                    c.border = border_all
-                    c.font = Font(size=6.5)
-                    c.alignment = align_center
-                except Exception:
-                    c = ws.cell(row=r, column=3 + len(issue_cols) + 1, value=qty_val)
-                    c.border = border_all
-                    c.font = Font(size=6.5)
-                    c.alignment = align_center
-                # Reduce row height to fit more vertically
-                ws.row_dimensions[r].height = 12
-                r += 1
-            # Totals row (Total Repair Modules) with full-width border
+    def open_batch_dialog():
+        # Ticked boards, else everything the current filters show
+        ids = list(selected_ids) or [iid.split(":", 1)[1] for iid in boards_table.all_ids()]
+        if not ids:
+            messagebox.showinfo("Batch Export", "No boards to quote.")
+            return
+        win = tk.Toplevel(page)
+        win.title("Batch Export Quotations")
+        frm = ttk.Frame(win)
+        frm.pack(fill="both", expand=True, padx=10, pady=10)
+        frm.columnconfigure(1, weight=1)
+        dir_var = tk.StringVar()
+        start_var = tk.StringVar(value="1")
+        by_site = tk.BooleanVar(value=True)
+        by_month = tk.BooleanVar(value=True)
+        ttk.Label(frm, text=f"{len(ids)} board(s)").grid(row=0, column=0, columnspan=3, sticky="w", padx=6, pady=4)
+        ttk.Label(frm, text="Folder").grid(row=1, column=0, sticky="w", padx=6, pady=4)
+        ttk.Entry(frm, textvariable=dir_var, width=40).grid(row=1, column=1, sticky="ew", padx=6, pady=4)
+        ttk.Button(frm, text="Browse", command=lambda: dir_var.set(filedialog.askdirectory(parent=win) or dir_var.get())).grid(row=1, column=2, padx=4)
+        ttk.Label(frm, text="One quotation per").grid(row=2, column=0, sticky="w", padx=6, pady=4)
+        grp = ttk.Frame(frm)
+        grp.grid(row=2, column=1, columnspan=2, sticky="w")
+        ttk.Checkbutton(grp, text="Site", variable=by_site).pack(side="left", padx=(6, 10))
+        ttk.Checkbutton(grp, text="Month (Date Request)", variable=by_month).pack(side="left")
+        ttk.Label(frm, text="First Quotation ID").grid(row=3, column=0, sticky="w", padx=6, pady=4)
+        ttk.Entry(frm, textvariable=start_var, width=10).grid(row=3, column=1, sticky="w", padx=6, pady=4)
+        bar = ttk.Progressbar(frm, mode="determinate", length=320)
+        bar.grid(row=4, column=0, columnspan=3, sticky="ew", padx=6, pady=(10, 4))
+        status = ttk.Label(frm, text="")
+        status.grid(row=5, column=0, columnspan=3, sticky="w", padx=6)
+
+        # Rendering runs on a thread (which drives the process pool);
+        # progress and the result come back through a queue
+        events = queue.Queue()
+
+        def start():
+            folder = dir_var.get().strip()
+            if not folder:
+                messagebox.showwarning("Batch Export", "Please choose a folder.", parent=win)
+                return
+            group_by = tuple(f for f, v in (("name", by_site), ("date_request", by_month)) if v.get())
+            if not group_by:
+                messagebox.showwarning("Batch Export", "Pick Site and/or Month.", parent=win)
+                return
             try:
-                total_qty = int(meta.get('total_repair_modules'))
-            except Exception:
-                total_qty = 0
-                for v in rows:
-                    try:
-                        total_qty += int(v[4])
-                    except Exception:
-                        pass
-            # Merge up to last column before Quantity
-            end_merge_col = 3 + len(issue_cols)
-            ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=end_merge_col)
-            ws.cell(row=r, column=1, value="Total Repair Modules (pcs)").font = Font(b=True)
-            ws.cell(row=r, column=1).alignment = Alignment(horizontal="right")
-            # Apply borders across merged range and qty cell
-            for c in range(1, end_merge_col + 2):
-                ws.cell(row=r, column=c).border = border_all
-            ws.cell(row=r, column=end_merge_col + 1, value=total_qty).font = Font(b=True)
-            r += 3
-
-            # Textual Remark section (replicating provided sample)
+                start_id = int(start_var.get().strip() or "1")
+            except ValueError:
+                messagebox.showwarning("Batch Export", "Quotation ID must be a number.", parent=win)
+                return
+            btn_start.configure(state="disabled")
+            status.configure(text="Grouping boards...")
+
+            def work():
+                try:
+                    res = batch_quotations(
+                        folder, group_by, board_ids=ids, start_id=start_id,
+                        progress=lambda done, total: events.put(("progress", done, total)),
+                    )
+                    events.put(("done", res))
+                except Exception as e:
+                    events.put(("error", str(e)))
+
+            threading.Thread(target=work, daemon=True).start()
+            page.after(100, poll)
+
+        def poll():
+            final = None
+            progress = None
             try:
-                medium = Side(style="medium", color="000000")
-                # "Remark:" label
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=17)
-                ws.cell(row=r, column=1, value="Remark:").font = Font(b=True, size=10)
-                ws.cell(row=r, column=1).alignment = Alignment(horizontal="left")
-                r += 1
-                # Notice text
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=17)
-                ws.cell(row=r, column=1, value="** Please Notice that above information is just an estimate cost of repair & rework for Led Modules.")
-                ws.cell(row=r, column=1).alignment = Alignment(horizontal="left")
-                ws.row_dimensions[r].height = 18
-                r += 2
-                # Authorized by (left) and Date (right) on same row
-                start_c = max(1, 17 - 6)
-                end_c = max(start_c + 2, 17 - 2)
-                left_end_col = max(1, start_c - 1)
-                ws.merge_cells(start_row=r, start_column=1, end_row=r, end_column=left_end_col)
-                ws.cell(row=r, column=1, value="Authorized  by :")
-                ws.cell(row=r, column=1).alignment = Alignment(horizontal="left")
-                # Date label aligned on right of the same row
-                ws.merge_cells(start_row=r, start_column=start_c, end_row=r, end_column=end_c)
-                ws.cell(row=r, column=start_c, value="Date:")
-                ws.cell(row=r, column=start_c).alignment = Alignment(horizontal="right")
-                r += 2
-                # Signature line (top medium border across a few columns)
-                sig_start_col = 1
-                sig_end_col = max(4, min(6, 17))
-                for cc in range(sig_start_col, sig_end_col + 1):
-                    ws.cell(row=r, column=cc).border = Border(top=medium)
-                ws.row_dimensions[r].height = 12
-                r += 1
-                # Team label
-                ws.cell(row=r, column=1, value="Repair & Rework Team")
-                ws.cell(row=r, column=1).alignment = Alignment(horizontal="left")
-                r += 2
-                # Spacer row after team line
-                r += 1
-            except Exception:
+                while True:
+                    ev = events.get_nowait()
+                    if ev[0] == "progress":
+                        progress = ev
+                    else:
+                        final = ev
+            except queue.Empty:
                 pass
-        wb.save(path)
-
-    def export_to_csv(path: str, rows, meta: dict):
-        import csv
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Quotation ID", meta.get('quotation_id','')])
-            writer.writerow(["Project Name", meta.get('project_name','')])
-            writer.writerow(["Project Code", meta.get('project_code','')])
-            writer.writerow(["Modules Code", meta.get('modules_code','')])
-            writer.writerow(["Total Repair Modules", meta.get('total_repair_modules','')])
-            writer.writerow(["Date Request", meta.get('date_request','')])
-            writer.writerow([])
-            writer.writerow(["Item", "Module No", "RN No", "Issue", "Quantity"])
-            for i, r in enumerate(rows, start=1):
-                writer.writerow([i, r[1], r[2], r[3], r[4]])
+            alive = bool(win.winfo_exists())
+            if alive and progress is not None:
+                _, done, total = progress
+                bar.configure(maximum=max(total, 1), value=done)
+                status.configure(text=f"Writing quotations: {done}/{total}")
+            if final is None:
+                page.after(100, poll)
+                return
+            if final[0] == "error":
+                if alive:
+                    status.configure(text="Export failed")
+                    btn_start.configure(state="normal")
+                messagebox.showerror("Batch Export", final[1])
+                return
+            res = final[1]
+            lines = [f"Wrote {res['quotations']} quotation(s) for {res['boards']} board(s).", f"Manifest: {res['manifest']}"]
+            lines += [f"{name}: {err}" for name, err in res["errors"]]
+            if alive:
+                status.configure(text=lines[0])
+                btn_start.configure(state="normal")
+            (messagebox.showwarning if res["errors"] else messagebox.showinfo)("Batch Export", "\n".join(lines))
+
+        btns = ttk.Frame(frm)
+        btns.grid(row=6, column=0, columnspan=3, sticky="e", pady=(8, 0))
+        btn_start = ttk.Button(btns, text="Export", command=start)
+        btn_start.pack(side="left", padx=6)
+        ttk.Button(btns, text="Close", command=win.destroy).pack(side="left", padx=6)
 
     # Bindings
     btn_add.configure(command=add_selected_to_quote)
     btn_remove.configure(command=remove_selected_from_quote)
     btn_clear.configure(command=clear_quote)
     btn_export.configure(command=export_quote)
-    ent_search.bind("<KeyRelease>", lambda _e: refresh_boards())
+    btn_batch.configure(command=open_batch_dialog)
+    ent_search.bind("<KeyRelease>", schedule_search)
 
     # Checkbox toggle only on first column
     def on_tree_click(event):
@@ -798,53 +542,22 @@ def run_quotations(parent: tk.Widget, list_boards: Callable[[], List[Dict[str, A
                 selected_ids.remove(bid)
             else:
                 selected_ids.add(bid)
-            vals = tv_boards.item(iid, "values")
-            chk = "☑" if bid in selected_ids else "☐"
-            tv_boards.item(iid, values=(chk,) + tuple(vals[1:]))
+            boards_table.refresh_row(iid)
             return
     tv_boards.bind("<Button-1>", on_tree_click, add="+")
 
     refresh_boards()
+    if board_changes is not None:
+        boards_table.follow(
+            board_changes, refresh_boards,
+            lookup=find_board_by_id, key=lambda b: str(b.get("board_id")),
+            fits=None if board_fits_query is None else (
+                lambda old, new: board_fits_query(old, new, **current_query())
+            ),
+        )
 
     # Simple in-place editing for Issue and Quantity
-    issue_fields = (
-        "caterpillar",
-        "pixel drop",
-        "pixel problem",
-        "kaki patah",
-        "green/red/blue line",
-        "box problem",
-        "module blackout",
-        "broken module",
-        "broken connector",
-        "broken power socket",
-        "wiring",
-        "broken frame",
-    )
-    # Mapping of issue header to possible board keys (normalized)
-    ISSUE_KEY_MAP = {
-        "caterpillar": ["caterpillar"],
-        "pixel drop": ["lamp_pixel_drop", "pixel_drop"],
-        "pixel problem": ["lamp_pixel_problem", "pixel_problem"],
-        "kaki patah": ["kakipatah", "kaki_patah"],
-        "green/red/blue line": [
-            "green/red/blue line",
-            "greenredblueline",
-            "anomalyline",
-            "line_issue",
-            "rgb_line",
-            "grb_line",
-            "rgbline",
-            "grbline",
-        ],
-        "box problem": ["boxproblem"],
-        "module blackout": ["moduleblackout", "halfwholemoduleblackout"],
-        "broken module": ["brokenmodule"],
-        "broken connector": ["brokenconnector"],
-        "broken power socket": ["brokenpowersocket"],
-        "wiring": ["wiring"],
-        "broken frame": ["brokenframe"],
-    }
+    issue_fields = ISSUE_FIELDS
 
     def begin_edit(event):
         iid = tv_quote.identify_row(event.y)
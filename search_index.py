@@ -0,0 +1,96 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+# Length of the n-grams in the posting lists; shorter queries scan the texts
+GRAM = 3
+
+
+def _grams(text: str) -> Set[str]:
+	# Per field: grams spanning a separator (NUL) can never be part of a match
+	return {f[i:i + GRAM] for f in text.split("\x00") for i in range(len(f) - GRAM + 1)}
+
+
+class SearchIndex:
+	"""Trigram inverted index for case-insensitive substring search.
+
+	Each key (a board_id) has one lower-cased text; fields are joined with
+	NUL so a query never matches across two of them. A query of three or
+	more characters intersects the posting sets of its trigrams, smallest
+	first, and only the surviving candidates are checked with a plain
+	substring test. Results come back in insertion order, like a dict scan.
+	"""
+
+	def __init__(self, items: Iterable = ()):
+		self._texts: Dict[str, str] = dict(items)
+		# Insertion position of each key, used to order results
+		self._ord: Dict[str, int] = {key: i for i, key in enumerate(self._texts)}
+		self._next = len(self._ord)
+		# Bulk build with lists (each key is appended once per gram), sets after
+		postings: Dict = {}
+		for key, text in self._texts.items():
+			for g in _grams(text):
+				keys = postings.get(g)
+				if keys is None:
+					postings[g] = keys = []
+				keys.append(key)
+		self._postings: Dict[str, Set[str]] = {g: set(keys) for g, keys in postings.items()}
+
+	def __len__(self) -> int:
+		return len(self._texts)
+
+	def add(self, key: str, text: str) -> None:
+		old = self._texts.get(key)
+		if old == text:
+			return
+		old_grams = _grams(old) if old is not None else set()
+		new_grams = _grams(text)
+		postings = self._postings
+		for g in old_grams - new_grams:
+			keys = postings[g]
+			keys.discard(key)
+			if not keys:
+				del postings[g]
+		for g in new_grams - old_grams:
+			keys = postings.get(g)
+			if keys is None:
+				postings[g] = {key}
+			else:
+				keys.add(key)
+		# Updating in place keeps the position, as assigning to a dict key does
+		self._texts[key] = text
+		if key not in self._ord:
+			self._ord[key] = self._next
+			self._next += 1
+
+	def discard(self, key: str) -> None:
+		text = self._texts.pop(key, None)
+		if text is None:
+			return
+		del self._ord[key]
+		postings = self._postings
+		for g in _grams(text):
+			keys = postings[g]
+			keys.discard(key)
+			if not keys:
+				del postings[g]
+
+	def search(self, needle: str, limit: Optional[int] = None) -> List[str]:
+		"""Keys whose text contains needle (already lower-cased), in insertion order."""
+		if not needle:
+			return list(self._texts)[:limit] if limit is not None else list(self._texts)
+		texts = self._texts
+		if len(needle) < GRAM or "\x00" in needle:
+			hits = [k for k, t in texts.items() if needle in t]
+			return hits[:limit] if limit is not None else hits
+		postings = self._postings
+		sets = []
+		for g in _grams(needle):
+			keys = postings.get(g)
+			if not keys:
+				return []
+			sets.append(keys)
+		sets.sort(key=len)
+		candidates = sets[0].intersection(*sets[1:])
+		# Trigrams all present does not mean they are adjacent: verify
+		hits = [k for k in candidates if needle in texts[k]]
+		hits.sort(key=self._ord.__getitem__)
+		return hits[:limit] if limit is not None else hits
@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Main  # noqa: E402
+from virtual_table import VirtualTable  # noqa: E402
+
+
+def board(bid, **fields):
+    b = {"board_id": bid, "name": "Site A", "size": "320x160", "date_request": "2025-03-01"}
+    b.update(fields)
+    return b
+
+
+class LiveRefreshTest(unittest.TestCase):
+    """VirtualTable.follow() swaps rows in place only while they still fit the view."""
+
+    def table(self, rows):
+        # Just the state _update_rows touches; no Tk window needed
+        refreshed = []
+        stub = SimpleNamespace(
+            rows=rows,
+            row_id=lambda b: str(b.get("board_id")),
+            _rendered={str(b["board_id"]): (b, ()) for b in rows},
+            refresh_row=refreshed.append,
+        )
+        return stub, refreshed
+
+    def update(self, stub, store, query):
+        return VirtualTable._update_rows(
+            stub, set(store), store.get,
+            lambda old, new: Main.board_fits_query(old, new, **query),
+            stub.row_id,
+        )
+
+    def test_edit_inside_filter_is_applied_in_place(self):
+        rows = [board("1"), board("2")]
+        stub, refreshed = self.table(rows)
+        store = {"1": board("1", size="320x160", ic="SM1627P")}
+        self.assertTrue(self.update(stub, store, {"site": "Site A"}))
+        self.assertEqual(stub.rows[0]["ic"], "SM1627P")
+        self.assertEqual(refreshed, ["1"])
+
+    def test_edit_out_of_filter_requests_reload(self):
+        rows = [board("1"), board("2")]
+        stub, refreshed = self.table(rows)
+        store = {"1": board("1", name="Site B")}
+        self.assertFalse(self.update(stub, store, {"site": "Site A"}))
+        self.assertEqual(stub.rows[0]["name"], "Site A")
+        self.assertEqual(refreshed, [])
+
+    def test_edit_out_of_search_or_month_requests_reload(self):
+        stub, _ = self.table([board("1")])
+        self.assertFalse(self.update(stub, {"1": board("1", name="Other")}, {"text": "site a"}))
+        self.assertFalse(self.update(stub, {"1": board("1", date_request="2025-04-01")}, {"months": [3]}))
+
+    def test_sort_key_change_requests_reload(self):
+        stub, _ = self.table([board("1", module_number="5"), board("2", module_number="9")])
+        store = {"1": board("1", module_number="12")}
+        self.assertFalse(self.update(stub, store, {"sort": "module_number"}))
+        # Same key, other field: still in place
+        store = {"1": board("1", module_number="5", ic="X")}
+        self.assertTrue(self.update(stub, store, {"sort": "module_number"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class ThumbnailCache:
+    """
+    Downscaled copies of board photos, cached on disk and in memory.
+
+    A thumbnail is keyed by the source path, its mtime and file size, and the
+    target box, so replacing a photo (or asking for another size) never hits a
+    stale entry. Thumbnails are written once as PNG under ``thumbs_dir``; the
+    most recently used ones are also kept decoded in an in-memory LRU.
+    Concurrent requests for the same key share one decode, and ``prune``
+    drops the files of photos that are gone or were replaced.
+
+    Returns Pillow images (not Tk images), so lookups are safe from worker
+    threads; wrap the result with ``ImageTk.PhotoImage`` on the Tk thread.
+    All methods return None when Pillow is not installed or the photo cannot
+    be read.
+
+    Parameters
+    ----------
+    thumbs_dir: str
+        Directory for the cached thumbnails (created on first write).
+    capacity: int
+        Number of decoded thumbnails kept in memory.
+    """
+
+    def __init__(self, thumbs_dir: str, capacity: int = 64):
+        self.thumbs_dir = thumbs_dir
+        self.capacity = capacity
+        self._lru: "OrderedDict[Tuple, Any]" = OrderedDict()
+        # Keys being loaded/generated right now -> the future other callers wait on
+        self._inflight: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, path: str, size: Tuple[int, int]) -> Optional[Tuple]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size, int(size[0]), int(size[1]))
+
+    @staticmethod
+    def _source_tag(abs_path: str) -> str:
+        return hashlib.sha1(abs_path.encode("utf-8")).hexdigest()[:20]
+
+    @staticmethod
+    def _version_tag(mtime_ns: int, size: int) -> str:
+        return hashlib.sha1(f"{mtime_ns}:{size}".encode("ascii")).hexdigest()[:12]
+
+    def _disk_path(self, key: Tuple) -> str:
+        # "<source>_<version>_<w>x<h>.png", so prune() can tell which photo
+        # (and which version of it) a file belongs to
+        name = f"{self._source_tag(key[0])}_{self._version_tag(key[1], key[2])}_{key[3]}x{key[4]}.png"
+        return os.path.join(self.thumbs_dir, name)
+
+    def get(self, path: str, size: Tuple[int, int]):
+        """Thumbnail of path fitting in size (w, h) as a Pillow image, or None."""
+        key = self._key(path, size)
+        if key is None:
+            return None
+        with self._lock:
+            img = self._lru.get(key)
+            if img is not None:
+                self._lru.move_to_end(key)
+                return img
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            # Another thread is decoding this exact thumbnail; share its result
+            return pending.result()
+        img = None
+        try:
+            img = self._load(path, key)
+        finally:
+            with self._lock:
+                if img is not None:
+                    self._lru[key] = img
+                    self._lru.move_to_end(key)
+                    while len(self._lru) > self.capacity:
+                        self._lru.popitem(last=False)
+                del self._inflight[key]
+            pending.set_result(img)
+        return img
+
+    def _load(self, path: str, key: Tuple):
+        try:
+            from PIL import Image  # Pillow
+        except ImportError:
+            return None
+        thumb_path = self._disk_path(key)
+        if os.path.exists(thumb_path):
+            try:
+                with Image.open(thumb_path) as f:
+                    return f.copy()
+            except Exception:
+                pass
+        return self._generate(path, key[3:], thumb_path)
+
+    def prune(self, sources: Iterable[str], dry_run: bool = False, tmp_grace: float = 3600) -> Tuple[int, int]:
+        """
+        Delete cached thumbnails except those of the current version of sources.
+
+        Files of deleted or replaced photos and unrecognised files go;
+        temp files are kept for tmp_grace seconds since a writer may still be
+        using them. Returns (files, bytes) removed.
+        """
+        keep = set()
+        for src in sources:
+            try:
+                st = os.stat(src)
+            except OSError:
+                continue
+            keep.add((self._source_tag(os.path.abspath(src)), self._version_tag(st.st_mtime_ns, st.st_size)))
+        try:
+            names = os.listdir(self.thumbs_dir)
+        except OSError:
+            return 0, 0
+        cutoff = time.time() - tmp_grace
+        removed = freed = 0
+        for name in names:
+            parts = name.split("_")
+            if name.endswith(".png") and len(parts) == 3 and (parts[0], parts[1]) in keep:
+                continue
+            path = os.path.join(self.thumbs_dir, name)
+            try:
+                st = os.stat(path)
+                if name.endswith(".tmp") and st.st_mtime > cutoff:
+                    continue
+                if not dry_run:
+                    os.remove(path)
+            except OSError:
+                continue
+            removed += 1
+            freed += st.st_size
+        return removed, freed
+
+    def _generate(self, path: str, size: Tuple[int, int], thumb_path: str):
+        from PIL import Image
+        try:
+            with Image.open(path) as src:
+                # Let JPEG decode at a reduced scale before the precise resample
+                src.draft("RGB", size)
+                img = src.copy()
+            img.thumbnail(size, Image.LANCZOS)
+        except Exception:
+            return None
+        if img.mode not in ("RGB", "RGBA", "L", "LA"):
+            img = img.convert("RGBA")
+        # Write to a temp name first so a concurrent reader never sees half a file
+        tmp = f"{thumb_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.thumbs_dir, exist_ok=True)
+            img.save(tmp, "PNG")
+            os.replace(tmp, thumb_path)
+        except Exception:
+            # Still usable from memory; it is simply regenerated next session
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        return img
@@ -1,9 +1,18 @@
 import tkinter as tk
 from tkinter import ttk
-from typing import Callable
+from typing import Any, Callable, Optional, Tuple
 
+from virtual_table import VirtualTable
 
-def run_viewer(list_boards: Callable[[], list]):
+
+def run_viewer(
+    list_boards: Callable[[], list],
+    query_boards: Callable[..., list],
+    distinct_board_values: Callable[[str], list],
+    board_changes: Optional[Callable[..., Tuple[int, Any]]] = None,
+    find_board_by_id: Optional[Callable[[str], Optional[dict]]] = None,
+    board_fits_query: Optional[Callable[..., bool]] = None,
+):
     root = tk.Toplevel()
     root.title("LED Boards Viewer (Read-only)")
     root.geometry("1000x500")
@@ -39,10 +48,9 @@ def run_viewer(list_boards: Callable[[], list]):
             pass
         frm = ttk.Frame(win)
         frm.pack(fill="both", expand=True, padx=10, pady=10)
-        boards = list_boards()
-        sites = ["All"] + sorted({b.get("name") or "-" for b in boards if b.get("name")})
-        sizes = ["All"] + sorted({b.get("size") or "-" for b in boards if b.get("size")})
-        users = ["All"] + sorted({b.get("created_by") or "-" for b in boards if b.get("created_by")})
+        sites = ["All"] + distinct_board_values("name")
+        sizes = ["All"] + distinct_board_values("size")
+        users = ["All"] + distinct_board_values("created_by")
         ttk.Label(frm, text="Site Name:").grid(row=0, column=0, padx=6, pady=4, sticky="w")
         cmb_site = ttk.Combobox(frm, values=sites, state="readonly", width=22, textvariable=site_q)
         cmb_site.grid(row=0, column=1, padx=6, pady=4, sticky="w")
@@ -94,7 +102,36 @@ def run_viewer(list_boards: Callable[[], list]):
         "Select", "ID", "Site Name", "IC", "DC", "Size", "Module Number", "Pixel", "Board Code", "Running No",
         "Date Request", "DO Date", "Date Repair", "Before Photo", "After Photo", "Urgency", "Added by"
     )
-    tree = ttk.Treeview(frame, columns=columns, show="headings", selectmode="extended")
+    def yn(v: bool) -> str:
+        return "✔" if bool(v) else "✘"
+
+    def board_row(b):
+        return (
+            "☑" if str(b.get("board_id")) in selected_ids else "☐",
+            b.get("board_id"),
+            b.get("name"),
+            b.get("ic"),
+            b.get("dc"),
+            b.get("size"),
+            b.get("module_number") or "-",
+            b.get("pixel") or "-",
+            b.get("board_code") or "-",
+            b.get("running_no") or "-",
+            b.get("date_request") or "-",
+            b.get("do_date") or "-",
+            b.get("date_repair") or "-",
+            b.get("before_photo") or "-",
+            b.get("after_photo") or "-",
+            yn(b.get("urgency", False)),
+            b.get("created_by") or "-",
+        )
+
+    # Only the visible window of rows is inserted into the Treeview
+    table = VirtualTable(
+        frame, columns, row_values=board_row, row_id=lambda b: str(b.get("board_id")),
+        xscroll=True, selectmode="extended",
+    )
+    tree = table.tree
     # Header click sorting still available
     sort_state = {"col": None, "reverse": False}
 
@@ -115,128 +152,56 @@ def run_viewer(list_boards: Callable[[], list]):
         if col in {"Urgency"}: width = 80
         tree.column(col, width=width, anchor="w")
 
-    yscroll = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
-    xscroll = ttk.Scrollbar(frame, orient="horizontal", command=tree.xview)
-    tree.configure(yscrollcommand=yscroll.set, xscrollcommand=xscroll.set)
-    tree.pack(fill="both", expand=True)
-    yscroll.pack(side="right", fill="y")
-    xscroll.pack(fill="x")
-
-    def yn(v: bool) -> str:
-        return "✔" if bool(v) else "✘"
-
-    def refresh():
-        for i in tree.get_children():
-            tree.delete(i)
-        boards = list_boards()
-        # Update selectable values from database
-        # Apply filters from dialog state
-        site_choice = site_q.get()
-        size_choice = size_q.get()
-        user_choice = user_q.get()
+    table.pack(fill="both", expand=True)
+
+    # Header column -> board field used for header-click sorting
+    sort_fields = {
+        "ID": "board_id",
+        "Site Name": "name",
+        "IC": "ic",
+        "DC": "dc",
+        "Size": "size",
+        "Module Number": "module_number",
+        "Pixel": "pixel",
+        "Board Code": "board_code",
+        "Running No": "running_no",
+        "Date Request": "date_request",
+        "DO Date": "do_date",
+        "Date Repair": "date_repair",
+        "Before Photo": "before_photo",
+        "After Photo": "after_photo",
+        "Added by": "created_by",
+        "Urgency": "urgency",
+        "No issue": "issues.no_issue",
+        "Total loss": "issues.total_loss",
+    }
+    sort_choices = {
+        "Date Request: Newest first": "-date_request",
+        "Date Request: Oldest first": "date_request",
+        "Module Number: Ascending": "module_number",
+        "Module Number: Descending": "-module_number",
+    }
+
+    def current_query():
+        def choice(var):
+            v = var.get()
+            return None if not v or v == "All" else v
         urg_choice = urg_q.get()
-        # Month selections (by Date Request)
-        sel_months = [m for m in month_names if month_q[m].get()]
-        month_map = {
-            "January": 1, "February": 2, "March": 3, "April": 4, "May": 5, "June": 6,
-            "July": 7, "August": 8, "September": 9, "October": 10, "November": 11, "December": 12
-        }
-        def match(b):
-            if site_choice and site_choice != "All" and (b.get("name") or "-") != site_choice:
-                return False
-            if size_choice and size_choice != "All" and (b.get("size") or "-") != size_choice:
-                return False
-            if user_choice and user_choice != "All" and (b.get("created_by") or "-") != user_choice:
-                return False
-            if urg_choice != "All":
-                want = True if urg_choice == "Yes" else False
-                if bool(b.get("urgency", False)) != want:
-                    return False
-            if sel_months:
-                dr = str(b.get("date_request") or "")
-                try:
-                    parts = dr.split("-")
-                    if len(parts) >= 2:
-                        month = int(parts[1])
-                        if month not in {month_map[m] for m in sel_months}:
-                            return False
-                    else:
-                        return False
-                except Exception:
-                    return False
-            return True
-        boards = [b for b in boards if match(b)]
-
-        # Sorting
-        col = sort_state["col"]
-        rev = sort_state["reverse"]
-        sort_choice = sort_q.get()
-        def key_for(b):
-            if col == "ID":
-                s = str(b.get("board_id") or "")
-                return (0, int(s)) if s.isdigit() else (1, s)
-            mapping = {
-                "Site Name": "name",
-                "IC": "ic",
-                "DC": "dc",
-                "Size": "size",
-                "Module Number": "module_number",
-                "Pixel": "pixel",
-                "Board Code": "board_code",
-                "Running No": "running_no",
-                "Date Request": "date_request",
-                "DO Date": "do_date",
-                "Date Repair": "date_repair",
-                "Before Photo": "before_photo",
-                "After Photo": "after_photo",
-                "Added by": "created_by",
-                "Urgency": "urgency",
-            }
-            if col in {"No issue", "Total loss"}:
-                iss = b.get("issues") or {}
-                key = "no_issue" if col == "No issue" else "total_loss"
-                return bool(iss.get(key, False))
-            field = mapping.get(col)
-            if not field:
-                return ""
-            val = b.get(field)
-            if field == "urgency":
-                return 1 if bool(val) else 0
-            return str(val or "").lower()
-        if sort_choice and sort_choice != "None":
-            if sort_choice.startswith("Date Request"):
-                def dr_key(x):
-                    return str(x.get("date_request") or "")
-                boards.sort(key=dr_key, reverse=("Newest" in sort_choice))
-            elif sort_choice.startswith("Module Number"):
-                def mn_key(x):
-                    v = str(x.get("module_number") or "").strip()
-                    return (0, int(v)) if v.isdigit() else (1, v.lower())
-                boards.sort(key=mn_key, reverse=("Desc" in sort_choice))
-        elif col:
-            boards.sort(key=key_for, reverse=rev)
+        sort = sort_choices.get(sort_q.get())
+        if not sort and sort_state["col"] in sort_fields:
+            sort = ("-" if sort_state["reverse"] else "") + sort_fields[sort_state["col"]]
+        return dict(
+            site=choice(site_q),
+            size=choice(size_q),
+            created_by=choice(user_q),
+            urgency=None if urg_choice == "All" else urg_choice == "Yes",
+            months=[idx for idx, m in enumerate(month_names, start=1) if month_q[m].get()],
+            sort=sort,
+        )
 
-        for b in boards:
-            chk = "☑" if b.get("board_id") in selected_ids else "☐"
-            tree.insert("", "end", values=(
-                chk,
-                b.get("board_id"),
-                b.get("name"),
-                b.get("ic"),
-                b.get("dc"),
-                b.get("size"),
-                b.get("module_number") or "-",
-                b.get("pixel") or "-",
-                b.get("board_code") or "-",
-                b.get("running_no") or "-",
-                b.get("date_request") or "-",
-                b.get("do_date") or "-",
-                b.get("date_repair") or "-",
-                b.get("before_photo") or "-",
-                b.get("after_photo") or "-",
-                yn(b.get("urgency", False)),
-                b.get("created_by") or "-",
-            ))
+    def refresh():
+        # Filters and sorting run in the storage layer (SQL for the sqlite backend)
+        table.set_rows(query_boards(**current_query()))
 
     # Toolbar
     toolbar = ttk.Frame(root)
@@ -250,18 +215,21 @@ def run_viewer(list_boards: Callable[[], list]):
         col = tree.identify_column(event.x)
         row = tree.identify_row(event.y)
         if col == "#1" and row:
-            vals = tree.item(row, "values")
-            bid = vals[1]
+            bid = str(row)
             if bid in selected_ids:
                 selected_ids.remove(bid)
             else:
                 selected_ids.add(bid)
-            new_chk = "☑" if bid in selected_ids else "☐"
-            tree.item(row, values=(new_chk,)+tuple(vals[1:]))
+            table.refresh_row(row)
             return
     tree.bind("<Button-1>", on_tree_click, add="+")
 
     refresh()
+    if board_changes is not None:
+        fits = None
+        if board_fits_query is not None:
+            fits = lambda old, new: board_fits_query(old, new, **current_query())
+        table.follow(board_changes, refresh, lookup=find_board_by_id, fits=fits)
     root.grab_set()
     root.focus_set()
     root.transient()
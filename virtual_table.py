@@ -0,0 +1,285 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class VirtualTable(ttk.Frame):
+    """
+    Treeview that only holds the rows currently on screen.
+
+    Rows are supplied as a sequence (a list, or anything with len() and
+    slicing). Only the visible window plus a small buffer is inserted into
+    the Treeview; scrolling, the mouse wheel and the page buttons move the
+    window and re-render it, so redraw cost does not grow with the row count.
+
+    Re-rendering is a diff against the rows already in the Treeview (by iid):
+    only rows that appeared, disappeared, moved or changed values cost Tk
+    calls, and selection/focus on untouched rows is kept.
+
+    Parameters
+    ----------
+    columns: tuple
+        Treeview column names.
+    row_values: Callable
+        Maps a row to the tuple of values shown in the columns.
+    row_id: Callable
+        Maps a row to its unique Treeview iid.
+    buffer: int
+        Extra rows rendered below the visible window.
+    xscroll: bool
+        Add a horizontal scrollbar.
+    """
+
+    def __init__(
+        self,
+        parent: tk.Widget,
+        columns: tuple,
+        row_values: Callable[[Any], tuple],
+        row_id: Callable[[Any], str],
+        buffer: int = 10,
+        xscroll: bool = False,
+        **tree_options,
+    ):
+        super().__init__(parent)
+        self.row_values = row_values
+        self.row_id = row_id
+        self.buffer = buffer
+        self.rows: Sequence = []
+        self.offset = 0
+        self.visible = int(tree_options.get("height") or 20)
+        self._index: Optional[Dict[str, int]] = None
+        # Rendered window: iids in Treeview order and iid -> (row, values)
+        self._order: List[str] = []
+        self._rendered: Dict[str, Tuple[Any, tuple]] = {}
+
+        self.tree = ttk.Treeview(self, columns=columns, show="headings", **tree_options)
+        self.vbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.vbar.grid(row=0, column=1, sticky="ns")
+        if xscroll:
+            hbar = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+            self.tree.configure(xscrollcommand=hbar.set)
+            hbar.grid(row=1, column=0, sticky="ew")
+        nav = ttk.Frame(self)
+        nav.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(4, 0))
+        ttk.Button(nav, text="◀ Prev", command=lambda: self.scroll_pages(-1)).pack(side="left")
+        ttk.Button(nav, text="Next ▶", command=lambda: self.scroll_pages(1)).pack(side="left", padx=4)
+        self._status = ttk.Label(nav, text="")
+        self._status.pack(side="left", padx=8)
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.tree.bind("<Configure>", self._on_resize, add="+")
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(seq, self._on_wheel, add="+")
+        self.tree.bind("<Prior>", lambda _e: self._scroll_key(-self.visible), add="+")
+        self.tree.bind("<Next>", lambda _e: self._scroll_key(self.visible), add="+")
+
+    # Data
+    def set_rows(self, rows: Sequence) -> None:
+        """Replace the row source, keeping the same top row in view where possible."""
+        anchor = self._order[0] if self._order else None
+        self.rows = rows
+        self._index = None
+        if anchor is not None and not (self.offset < len(rows) and self.row_id(rows[self.offset]) == anchor):
+            idx = self._row_index().get(anchor)
+            if idx is not None:
+                self.offset = idx
+        self.offset = max(0, min(self.offset, len(rows) - self.visible))
+        self._render()
+
+    def refresh_row(self, iid: str) -> None:
+        """Re-render one row in place, e.g. after its checkbox state changed."""
+        entry = self._rendered.get(iid)
+        if entry is None:
+            return
+        row, old_values = entry
+        values = self.row_values(row)
+        if values != old_values:
+            self.tree.item(iid, values=values)
+            self._rendered[iid] = (row, values)
+
+    def follow(
+        self,
+        changes: Callable[[Optional[int]], Tuple[int, Any]],
+        reload: Callable[[], None],
+        lookup: Optional[Callable[[str], Any]] = None,
+        fits: Optional[Callable[[Any, Any], bool]] = None,
+        key: Optional[Callable[[Any], str]] = None,
+        interval_ms: int = 1000,
+    ) -> None:
+        """
+        Keep the rows current with changes saved elsewhere.
+
+        changes is Main.board_changes: it answers from memory, so polling it
+        from the Tk loop costs nothing while the data is unchanged. When it
+        names the changed records and lookup(id) and fits(old, new) are
+        given, rows already in the table are swapped for their new version
+        in place, provided fits says the new version still matches the
+        view's filters and sort position. reload() (a re-query) runs
+        otherwise: a changed record is new to the table, was deleted, no
+        longer fits, or the IDs are unknown. key maps a row to the IDs
+        changes reports (default: row_id). Polling stops when the table is
+        destroyed.
+        """
+        seq, _ids = changes(None)
+
+        def tick():
+            nonlocal seq
+            try:
+                latest, ids = changes(seq)
+                if latest != seq:
+                    seq = latest
+                    if (
+                        ids is None or lookup is None or fits is None
+                        or not self._update_rows(ids, lookup, fits, key or self.row_id)
+                    ):
+                        reload()
+            except Exception:
+                # One failed refresh must not end live updates; the next change retries
+                pass
+            finally:
+                self._follow_after = self.after(interval_ms, tick)
+
+        self._follow_after = self.after(interval_ms, tick)
+
+    def _update_rows(
+        self,
+        ids,
+        lookup: Callable[[str], Any],
+        fits: Callable[[Any, Any], bool],
+        key: Callable[[Any], str],
+    ) -> bool:
+        # In-place update for follow(); False when the row set itself may change
+        if not isinstance(self.rows, list):
+            return False
+        positions = {key(r): i for i, r in enumerate(self.rows)}
+        updates = []
+        for rid in ids:
+            row = lookup(rid)
+            idx = positions.get(rid)
+            if idx is None:
+                if row is None:
+                    # Deleted and not listed here anyway
+                    continue
+                # New, or edited into the current filter
+                return False
+            if row is None or not fits(self.rows[idx], row):
+                # Deleted, or edited out of the filter / to another sort position
+                return False
+            updates.append((idx, row))
+        for idx, row in updates:
+            iid = self.row_id(self.rows[idx])
+            self.rows[idx] = row
+            entry = self._rendered.get(iid)
+            if entry is not None:
+                self._rendered[iid] = (row, entry[1])
+                self.refresh_row(iid)
+        return True
+
+    def destroy(self) -> None:
+        if getattr(self, "_follow_after", None) is not None:
+            self.after_cancel(self._follow_after)
+            self._follow_after = None
+        super().destroy()
+
+    def all_ids(self) -> List[str]:
+        return [self.row_id(r) for r in self.rows]
+
+    def get_row(self, iid: str) -> Any:
+        idx = self._row_index().get(iid)
+        return None if idx is None else self.rows[idx]
+
+    def _row_index(self) -> Dict[str, int]:
+        if self._index is None:
+            self._index = {self.row_id(r): i for i, r in enumerate(self.rows)}
+        return self._index
+
+    # Scrolling
+    def scroll_to(self, offset: int) -> None:
+        max_off = max(0, len(self.rows) - self.visible)
+        offset = max(0, min(int(offset), max_off))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+            self.tree.yview_moveto(0)
+
+    def scroll_pages(self, pages: int) -> None:
+        self.scroll_to(self.offset + pages * self.visible)
+
+    def see(self, iid: str) -> None:
+        idx = self._row_index().get(iid)
+        if idx is not None and not (self.offset <= idx < self.offset + self.visible):
+            self.scroll_to(idx - self.visible // 2)
+
+    def _on_scrollbar(self, action: str, *args) -> None:
+        if action == "moveto":
+            self.scroll_to(int(float(args[0]) * len(self.rows)))
+        elif action == "scroll":
+            step = int(args[0])
+            self.scroll_to(self.offset + (step * self.visible if args[1] == "pages" else step))
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            step = -3
+        elif event.num == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self.scroll_to(self.offset + step)
+        return "break"
+
+    def _scroll_key(self, step: int):
+        self.scroll_to(self.offset + step)
+        return "break"
+
+    def _on_resize(self, event) -> None:
+        try:
+            rowheight = int(ttk.Style(self).lookup("Treeview", "rowheight") or 20)
+        except Exception:
+            rowheight = 20
+        # Leave room for the heading row
+        visible = max(1, (event.height - 24) // rowheight)
+        if visible != self.visible:
+            self.visible = visible
+            self._render()
+
+    # Rendering
+    def _render(self) -> None:
+        tree = self.tree
+        rendered = self._rendered
+        end = min(len(self.rows), self.offset + self.visible + self.buffer)
+        window = [(self.row_id(r), r) for r in self.rows[self.offset:end]]
+        wanted = {iid for iid, _row in window}
+        gone = [iid for iid in self._order if iid not in wanted]
+        if gone:
+            tree.delete(*gone)
+            for iid in gone:
+                del rendered[iid]
+        order = [iid for iid in self._order if iid in wanted]
+        for idx, (iid, row) in enumerate(window):
+            values = self.row_values(row)
+            if iid not in rendered:
+                tree.insert("", idx, iid=iid, values=values)
+                order.insert(idx, iid)
+                rendered[iid] = (row, values)
+                continue
+            if idx >= len(order) or order[idx] != iid:
+                tree.move(iid, "", idx)
+                order.remove(iid)
+                order.insert(idx, iid)
+            if rendered[iid][1] != values:
+                tree.item(iid, values=values)
+            rendered[iid] = (row, values)
+        self._order = order
+        self._update_scrollbar()
+
+    def _update_scrollbar(self) -> None:
+        total = len(self.rows)
+        if not total:
+            self.vbar.set(0, 1)
+            self._status.configure(text="No rows")
+            return
+        last = min(total, self.offset + self.visible)
+        self.vbar.set(self.offset / total, last / total)
+        self._status.configure(text=f"Rows {self.offset + 1}–{last} of {total}")